@@ -20,11 +20,30 @@ def create_app(test_config=None):
     except OSError:
         pass
 
-    global _HISTORY, _ROOM_HAS_SYSTEM, _SID_ROOM, _SID_USER
+    global _HISTORY
     _HISTORY = []
-    _ROOM_HAS_SYSTEM = set()
-    _SID_ROOM = {}
-    _SID_USER = {}
+
+    global socket_state
+    from .utils import MemorySocketState, RedisSocketState
+
+    if app.config["SOCKET_STATE_BACKEND"] == "redis":
+        from .config import celery_url
+
+        socket_state = RedisSocketState(celery_url, ttl=app.config["SOCKET_STATE_TTL"])
+    else:
+        socket_state = MemorySocketState()
+
+    global idempotency_store
+    from .utils import MemoryIdempotencyStore, RedisIdempotencyStore
+
+    if app.config["IDEMPOTENCY_BACKEND"] == "redis":
+        from .config import celery_url
+
+        idempotency_store = RedisIdempotencyStore(
+            celery_url, ttl=app.config["IDEMPOTENCY_TTL"]
+        )
+    else:
+        idempotency_store = MemoryIdempotencyStore(ttl=app.config["IDEMPOTENCY_TTL"])
 
     global celery_app
     celery_app = celery_init_app(app)
@@ -43,15 +62,74 @@ def create_app(test_config=None):
     socket_io.init_app(app)
     init_cloudinary()
 
-    from .utils import load_key_pair
+    global async_mongo
+    from .databases import AsyncMongo
+
+    async_mongo = None
+    if app.config["DATABASE_DRIVER"] == "async":
+        async_mongo = AsyncMongo(
+            app.config["MONGODB_SETTINGS"]["host"],
+            app.config["MONGODB_SETTINGS"]["db"],
+        )
+
+    global chat_history_buffer
+    from .databases import (
+        ChatHistoryWriteBehind,
+        ChatHistorySpill,
+        CHAT_HISTORY_SPILL_FILE,
+    )
+
+    chat_history_buffer = ChatHistoryWriteBehind(
+        socket_io,
+        flush_interval=app.config["CHAT_HISTORY_FLUSH_INTERVAL_MS"] / 1000,
+        max_batch=app.config["CHAT_HISTORY_FLUSH_BATCH"],
+        max_retries=app.config["CHAT_HISTORY_FLUSH_RETRIES"],
+        on_drop=ChatHistorySpill(
+            os.path.join(app.instance_path, CHAT_HISTORY_SPILL_FILE)
+        ),
+        logger=app.logger,
+    )
+
+    global revocation_filter
+    from .utils import RevocationFilter, RedisRevocationFilter
+
+    if app.config["REVOCATION_FILTER_BACKEND"] == "redis":
+        from .config import celery_url
+
+        revocation_filter = RedisRevocationFilter(
+            socket_io,
+            celery_url,
+            capacity=app.config["REVOCATION_FILTER_CAPACITY"],
+            error_rate=app.config["REVOCATION_FILTER_ERROR_RATE"],
+        )
+    else:
+        revocation_filter = RevocationFilter(
+            capacity=app.config["REVOCATION_FILTER_CAPACITY"],
+            error_rate=app.config["REVOCATION_FILTER_ERROR_RATE"],
+        )
+
+    global countdown_scheduler
+    from .utils import CountdownScheduler
+
+    countdown_scheduler = CountdownScheduler(socket_io)
+
+    from .utils import load_key_pair, load_verification_keys, key_algorithm, key_id
 
-    global private_key, public_key
+    global private_key, public_key, verification_keys, jwt_algorithm, jwt_key_id
     private_key, public_key = load_key_pair(BASE_DIR)
+    jwt_algorithm = key_algorithm(private_key)
+    if jwt_algorithm != app.config["JWT_ALGORITHM"]:
+        raise ValueError(
+            f"keys/private.pem is a {jwt_algorithm} key but JWT_ALGORITHM is {app.config['JWT_ALGORITHM']}"
+        )
+    jwt_key_id = key_id(public_key)
+    verification_keys = load_verification_keys(BASE_DIR, public_key)
 
     from .routers import register_blueprints
     from .error_handlers import register_error_handlers
     from .middlewares import register_middlewares
     from .sockets import register_socket_io
+    from .commands import register_commands
 
     @app.route("/")
     def index():
@@ -61,5 +139,6 @@ def create_app(test_config=None):
     register_blueprints(app)
     register_error_handlers(app)
     register_middlewares(app)
+    register_commands(app)
 
     return app
@@ -0,0 +1,317 @@
+import os
+import datetime
+import click
+import mongoengine as me
+from bson import ObjectId
+from pymongo import ReplaceOne
+from flask import current_app
+from flask.cli import AppGroup
+from . import models
+from .config import chat_history_bucket_size
+from .databases import (
+    bucket_message,
+    chat_history_store,
+    ChatHistorySpill,
+    CHAT_HISTORY_SPILL_FILE,
+)
+from .models import (
+    UserModel,
+    ChatHistoryModel,
+    ChatHistoryBucketModel,
+    ChatRoomModel,
+    AccountActiveModel,
+    ResetPasswordModel,
+    OtpEmailModel,
+    BlacklistTokenModel,
+    RefreshTokenModel,
+)
+
+indexes_cli = AppGroup("indexes", help="Inspect and create MongoDB indexes.")
+chat_history_cli = AppGroup("chat-history", help="Maintain chat history storage.")
+tokens_cli = AppGroup("tokens", help="Maintain activation, reset and OTP tokens.")
+
+
+def document_models():
+    return sorted(
+        {
+            model
+            for model in vars(models).values()
+            if isinstance(model, type)
+            and issubclass(model, me.Document)
+            and not model._meta.get("abstract")
+        },
+        key=lambda model: model._get_collection_name(),
+    )
+
+
+def repository_queries():
+    user_id = ObjectId()
+    room_id = ObjectId()
+    return [
+        ("users by email", UserModel.objects(email="user@example.com")),
+        (
+            "chat history by room",
+            ChatHistoryModel.objects(room=room_id).order_by("id"),
+        ),
+        (
+            "chat history buckets by room",
+            ChatHistoryBucketModel.objects(room=room_id).order_by("id"),
+        ),
+        (
+            "active rooms by user",
+            ChatRoomModel.objects(user=user_id, deleted_at=None).order_by("-id"),
+        ),
+        (
+            "rooms by user",
+            ChatRoomModel.objects(user=user_id).order_by("-id"),
+        ),
+        ("room by name", ChatRoomModel.objects(room="room", user=user_id)),
+        ("account active by token", AccountActiveModel.objects(token="token")),
+        ("account active by user", AccountActiveModel.objects(user=user_id)),
+        ("reset password by token", ResetPasswordModel.objects(token="token")),
+        ("otp email by user", OtpEmailModel.objects(user=user_id)),
+        ("blacklist by jti", BlacklistTokenModel.objects(jti="jti")),
+        ("refresh token by jti", RefreshTokenModel.objects(jti="jti")),
+        ("refresh token by family", RefreshTokenModel.objects(family="family")),
+    ]
+
+
+def plan_stages(plan):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
+
+
+@indexes_cli.command("diff")
+def diff_indexes():
+    """Show declared indexes that are missing or not declared."""
+    clean = True
+    for model in document_models():
+        difference = model.compare_indexes()
+        for index in difference["missing"]:
+            clean = False
+            click.echo(f"+ {model._get_collection_name()} {index}")
+        for index in difference["extra"]:
+            clean = False
+            click.echo(f"- {model._get_collection_name()} {index}")
+    if clean:
+        click.echo("indexes are up to date")
+
+
+@indexes_cli.command("ensure")
+def ensure_indexes():
+    """Create every index declared in model meta."""
+    for model in document_models():
+        model.ensure_indexes()
+        click.echo(f"ensured {model._get_collection_name()}")
+
+
+def query_plans():
+    """Yield (label, stages) of the winning plan for every repository query."""
+    for label, queryset in repository_queries():
+        winning_plan = queryset.explain()["queryPlanner"]["winningPlan"]
+        yield label, [stage for stage in plan_stages(winning_plan) if stage]
+
+
+@indexes_cli.command("explain")
+def explain_queries():
+    """Fail when a repository query falls back to a collection scan."""
+    collection_scans = 0
+    for label, stages in query_plans():
+        if "COLLSCAN" in stages:
+            collection_scans += 1
+        click.echo(f"{label}: {' <- '.join(stages)}")
+    if collection_scans:
+        raise click.ClickException(f"{collection_scans} queries scan a collection")
+
+
+@chat_history_cli.command("migrate")
+@click.option("--bucket-size", default=chat_history_bucket_size, show_default=True)
+@click.option(
+    "--delete-source",
+    is_flag=True,
+    help="Delete per-message documents once they are in a bucket.",
+)
+def migrate_chat_history(bucket_size, delete_source):
+    """Pack per-message chat history into room buckets.
+
+    Safe to re-run: messages already present in a bucket are skipped. Switch
+    CHAT_HISTORY_LAYOUT to bucket first so nothing is written to the old
+    collection after its room has been migrated. Migrated buckets are closed,
+    so new messages start a bucket of their own instead of filling a gap in
+    old history.
+    """
+    source = ChatHistoryModel._get_collection()
+    target = ChatHistoryBucketModel._get_collection()
+    if source.find_one(legacy_filter(ChatHistoryModel), {"_id": 1}):
+        raise click.ClickException(
+            "chat_history holds documents in the old format, "
+            "run `flask chat-history compact` first"
+        )
+    room_field = ChatHistoryModel.room.db_field
+    messages_field = ChatHistoryBucketModel.messages.db_field
+    migrated = 0
+    for room in source.distinct(room_field):
+        bucketed = {
+            message["_id"]
+            for bucket in target.find(
+                {ChatHistoryBucketModel.room.db_field: room},
+                {f"{messages_field}._id": 1},
+            )
+            for message in bucket.get(messages_field, [])
+        }
+        pending = []
+        for son in source.find({room_field: room}).sort("_id", 1):
+            if son["_id"] in bucketed:
+                continue
+            pending.append(son)
+            if len(pending) == bucket_size:
+                migrated += insert_bucket(target, source, pending, delete_source)
+                pending = []
+        if pending:
+            migrated += insert_bucket(target, source, pending, delete_source)
+        if delete_source and bucketed:
+            source.delete_many({"_id": {"$in": list(bucketed)}})
+    click.echo(f"migrated {migrated} messages")
+
+
+def insert_bucket(target, source, sons, delete_source):
+    messages = [
+        bucket_message(ChatHistoryModel._from_son(son, created=False)) for son in sons
+    ]
+    target.insert_one(
+        {
+            "_id": messages[0]["_id"],
+            ChatHistoryBucketModel.room.db_field: sons[0][
+                ChatHistoryModel.room.db_field
+            ],
+            ChatHistoryBucketModel.count.db_field: len(messages),
+            ChatHistoryBucketModel.closed.db_field: True,
+            ChatHistoryBucketModel.messages.db_field: messages,
+        }
+    )
+    if delete_source:
+        source.delete_many({"_id": {"$in": [son["_id"] for son in sons]}})
+    return len(messages)
+
+
+# Keys the compact encoding no longer stores: the room implies the user and
+# creation time is read from the _id.
+DROPPED_KEYS = {
+    ChatRoomModel: ("created_at",),
+    ChatHistoryModel: ("user", "created_at", "updated_at", "deleted_at"),
+    ChatHistoryBucketModel: ("user",),
+}
+
+
+def renamed_fields(document_type):
+    return [
+        name
+        for name, field in document_type._fields.items()
+        if field.db_field != name and name != "id"
+    ]
+
+
+def legacy_filter(document_type):
+    keys = renamed_fields(document_type) + list(DROPPED_KEYS.get(document_type, ()))
+    return {"$or": [{key: {"$exists": True}} for key in keys]}
+
+
+def compact_values(document_type, son):
+    # Legacy documents were stored under the field names, so map them back
+    # onto the fields and let to_mongo write the short keys. A document may
+    # already hold some short keys, those are read back as stored.
+    values = {}
+    for name, field in document_type._fields.items():
+        stored = field.db_field in son
+        if not stored and name not in son:
+            continue
+        value = son[field.db_field if stored else name]
+        if isinstance(field, me.EmbeddedDocumentListField):
+            embedded = field.field.document_type
+            value = [embedded(**compact_values(embedded, item)) for item in value]
+        elif stored:
+            value = field.to_python(value)
+        values[name] = value
+    return values
+
+
+@chat_history_cli.command("restore-dropped")
+def restore_dropped_chat_history():
+    """Write back messages the write-behind buffer gave up on."""
+    spill = ChatHistorySpill(
+        os.path.join(current_app.instance_path, CHAT_HISTORY_SPILL_FILE)
+    )
+    documents = spill.read()
+    failed = chat_history_store.insert_many(documents) if documents else []
+    spill.replace(failed)
+    click.echo(f"restored {len(documents) - len(failed)} messages, {len(failed)} left")
+
+
+@chat_history_cli.command("compact")
+@click.option("--batch-size", default=1000, show_default=True)
+def compact_chat_collections(batch_size):
+    """Rewrite chat rooms and history with short keys and compressed text.
+
+    Run with writers stopped: indexes on the old field names are dropped
+    first and the declared ones are created once every document is
+    rewritten. Safe to re-run, only documents still holding an old or
+    dropped key are touched.
+    """
+    for model in (ChatRoomModel, ChatHistoryModel, ChatHistoryBucketModel):
+        collection = model._get_collection()
+        stored = {field.db_field for field in model._fields.values()}
+        for name, index in collection.index_information().items():
+            if any(key not in stored for key, _ in index["key"]):
+                collection.drop_index(name)
+        rewritten = 0
+        batch = []
+        for son in collection.find(legacy_filter(model)):
+            document = model(**compact_values(model, son))
+            batch.append(ReplaceOne({"_id": son["_id"]}, document.to_mongo()))
+            if len(batch) == batch_size:
+                rewritten += collection.bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            rewritten += collection.bulk_write(batch, ordered=False).modified_count
+        model.ensure_indexes()
+        click.echo(f"compacted {rewritten} {collection.name} documents")
+
+
+@tokens_cli.command("convert-otp-dates")
+def convert_otp_dates():
+    """Convert OTP rows stored with epoch-second timestamps to dates.
+
+    Rows written before expired_at became a DateTimeField hold integers,
+    which the TTL index never expires and active() never matches. Safe to
+    re-run.
+    """
+    collection = OtpEmailModel._get_collection()
+    fields = ("created_at", "updated_at", "expired_at")
+    converted = 0
+    for son in collection.find(
+        {"$or": [{field: {"$type": "number"}} for field in fields]}
+    ):
+        collection.update_one(
+            {"_id": son["_id"]},
+            {
+                "$set": {
+                    field: datetime.datetime.fromtimestamp(
+                        son[field], datetime.timezone.utc
+                    )
+                    for field in fields
+                    if isinstance(son.get(field), (int, float))
+                }
+            },
+        )
+        converted += 1
+    click.echo(f"converted {converted} otp email documents")
+
+
+def register_commands(app):
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(chat_history_cli)
+    app.cli.add_command(tokens_cli)
@@ -13,6 +13,9 @@ class Config:
         "connect": False,
     }
 
+    DATABASE_DRIVER = database_driver
+    QUERY_COUNT_HEADER = query_count_header
+
     MAIL_SERVER = smtp_host
     MAIL_PORT = smtp_port
     MAIL_USE_TLS = True
@@ -23,6 +26,24 @@ class Config:
 
     CORS_SUPPORTS_CREDENTIALS = True
 
+    SOCKET_STATE_BACKEND = socket_state_backend
+    SOCKET_STATE_TTL = socket_state_ttl
+
+    CHAT_HISTORY_FLUSH_INTERVAL_MS = chat_history_flush_interval_ms
+    CHAT_HISTORY_FLUSH_BATCH = chat_history_flush_batch
+    CHAT_HISTORY_FLUSH_RETRIES = chat_history_flush_retries
+
+    IDEMPOTENCY_BACKEND = idempotency_backend
+    IDEMPOTENCY_TTL = idempotency_ttl
+
+    REVOCATION_FILTER_BACKEND = revocation_filter_backend
+    REVOCATION_FILTER_CAPACITY = revocation_filter_capacity
+    REVOCATION_FILTER_ERROR_RATE = revocation_filter_error_rate
+
+    JWT_ALGORITHM = jwt_algorithm
+
+    BCRYPT_LOG_ROUNDS = bcrypt_log_rounds
+
 
 class TestConfig(Config):
     MONGODB_SETTINGS = {
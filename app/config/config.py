@@ -7,6 +7,8 @@ database_mongodb = os.getenv("DATABASE_MONGODB")
 database_mongodb_dev = os.getenv("DATABASE_MONGODB_DEV")
 database_mongodb_url = os.getenv("DATABASE_MONGODB_URL")
 database_mongodb_url_dev = os.getenv("DATABASE_MONGODB_URL_DEV")
+database_driver = os.getenv("DATABASE_DRIVER", "mongoengine")
+query_count_header = os.getenv("QUERY_COUNT_HEADER", "false").lower() == "true"
 salt_account_active = os.getenv("SALT_ACCOUNT_ACTIVE")
 secret_key_account_active = os.getenv("SECRET_KEY_ACCOUNT_ACTIVE")
 salt_reset_password = os.getenv("SALT_RESET_PASSWORD")
@@ -28,3 +30,36 @@ imagekit_public_key = os.getenv("IMAGEKIT_PUBLIC_KEY")
 imagekit_private_key = os.getenv("IMAGEKIT_PRIVATE_KEY")
 imagekit_url_endpoint = os.getenv("IMAGEKIT_URL_ENDPOINT")
 default_folder = os.getenv("DEFAULT_FOLDER", "generated-images")
+socket_state_backend = os.getenv("SOCKET_STATE_BACKEND", "memory")
+socket_state_ttl = int(os.getenv("SOCKET_STATE_TTL", 24 * 60 * 60))
+chat_max_concurrency = int(os.getenv("CHAT_MAX_CONCURRENCY", 16))
+chat_history_flush_interval_ms = int(os.getenv("CHAT_HISTORY_FLUSH_INTERVAL_MS", 50))
+chat_history_flush_batch = int(os.getenv("CHAT_HISTORY_FLUSH_BATCH", 100))
+chat_history_flush_retries = int(os.getenv("CHAT_HISTORY_FLUSH_RETRIES", 5))
+chat_history_layout = os.getenv("CHAT_HISTORY_LAYOUT", "document")
+chat_history_bucket_size = int(os.getenv("CHAT_HISTORY_BUCKET_SIZE", 100))
+chat_text_codec = os.getenv("CHAT_TEXT_CODEC", "zlib")
+chat_text_compress_min = int(os.getenv("CHAT_TEXT_COMPRESS_MIN", 1024))
+idempotency_backend = os.getenv("IDEMPOTENCY_BACKEND", "memory")
+idempotency_ttl = int(os.getenv("IDEMPOTENCY_TTL", 10 * 60))
+# "msgpack" switches the whole Socket.IO server to binary packets. Every
+# client must then use socket.io-msgpack-parser; JSON-only clients (including
+# the bundled demo page) can no longer connect. See README.md.
+socketio_serializer = os.getenv("SOCKETIO_SERIALIZER", "default")
+socketio_compression_threshold = int(os.getenv("SOCKETIO_COMPRESSION_THRESHOLD", 1024))
+validation_debounce_ms = int(os.getenv("VALIDATION_DEBOUNCE_MS", 150))
+email_dns_timeout = float(os.getenv("EMAIL_DNS_TIMEOUT", 2))
+email_deliverable_ttl = int(os.getenv("EMAIL_DELIVERABLE_TTL", 6 * 60 * 60))
+email_undeliverable_ttl = int(os.getenv("EMAIL_UNDELIVERABLE_TTL", 10 * 60))
+auth_cache_ttl = int(os.getenv("AUTH_CACHE_TTL", 30))
+revocation_filter_backend = os.getenv("REVOCATION_FILTER_BACKEND", "memory")
+revocation_filter_capacity = int(os.getenv("REVOCATION_FILTER_CAPACITY", 100000))
+revocation_filter_error_rate = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", 0.001))
+jwt_algorithm = os.getenv("JWT_ALGORITHM", "RS256")
+access_token_ttl = int(os.getenv("ACCESS_TOKEN_TTL", 15 * 60))
+refresh_token_ttl = int(os.getenv("REFRESH_TOKEN_TTL", 30 * 24 * 60 * 60))
+bcrypt_log_rounds = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+password_hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+google_client_id = os.getenv("GOOGLE_CLIENT_ID", "")
+google_userinfo_ttl = int(os.getenv("GOOGLE_USERINFO_TTL", 5 * 60))
+google_http_timeout = float(os.getenv("GOOGLE_HTTP_TIMEOUT", 5))
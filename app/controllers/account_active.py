@@ -11,7 +11,6 @@ from ..utils import (
 import datetime
 from ..serializers import UserSerializer, TokenSerializer
 from ..config import web_short_me
-from ..dataclasses import AccessTokenSchema
 
 
 class AccountActiveController:
@@ -186,18 +185,21 @@ class AccountActiveController:
             user_id=f"{user_token.user.id}",
             otp=user_token.otp,
         )
-        access_token = await AuthJwt.generate_jwt_async(
-            f"{user_data.user.id}", timestamp
+        token_model = await AuthJwt.generate_token_pair_async(
+            f"{user_data.user.id}",
+            timestamp,
+            token_version=user_data.user.token_version,
         )
-        token_model = AccessTokenSchema(access_token, timestamp)
         token_data = self.token_serializer.serialize(token_model)
         current_user = self.user_seliazer.serialize(user_token.user)
-        token_data = self.token_serializer.serialize(user_token, otp_is_null=True)
+        account_active_data = self.token_serializer.serialize(
+            user_token, otp_is_null=True
+        )
         return (
             jsonify(
                 {
                     "message": "email verified successfully",
-                    "data": token_data,
+                    "data": account_active_data,
                     "user": current_user,
                     "token": token_data,
                 }
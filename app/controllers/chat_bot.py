@@ -4,13 +4,15 @@ from ..utils import (
     Validation,
     GeminiAI,
     ImageKitImageGenerator,
+    user_channel,
+    chat_batch,
 )
 from ..serializers import ChatHistorySerializer, RoomChatSerializer
 import os
 import datetime
 from ..models import ChatRoomModel, ChatHistoryModel
 import uuid
-from .. import socket_io
+from .. import socket_io, chat_history_buffer, idempotency_store
 import tempfile
 
 
@@ -53,7 +55,7 @@ class ChatBotController:
         ):
             return jsonify({"message": "chat history not found"}), 404
 
-    async def create_message(self, user, text, room, docs):
+    async def create_message(self, user, text, room, docs, idempotency_key=None):
         errors = {}
         await Validation.validate_required_text_async(errors, "text", text)
         if docs:
@@ -63,22 +65,43 @@ class ChatBotController:
                 errors["file"] = "IS_INVALID"
         if errors:
             return jsonify({"errors": errors, "message": "validation errors"}), 400
+        if idempotency_key:
+            idempotency_key = f"messages:{user.id}:{idempotency_key}"
+            if record := idempotency_store.begin(
+                idempotency_key, {"status": "in_progress"}
+            ):
+                if record["status"] == "done":
+                    return jsonify(record["response"]), 200
+                return jsonify({"message": "request is still being processed"}), 409
+        try:
+            response_data = self._create_message(user, text, room, docs)
+        except BaseException:
+            if idempotency_key:
+                idempotency_store.discard(idempotency_key)
+            raise
+        if idempotency_key:
+            idempotency_store.complete(
+                idempotency_key, {"status": "done", "response": response_data}
+            )
+        return jsonify(response_data)
+
+    def _create_message(self, user, text, room, docs):
         if not room:
             room = f"room-{uuid.uuid4().hex}"
-        user_room = ChatRoomModel.objects(room=room, user=user).first()
-        if not user_room:
-            user_room = ChatRoomModel(room=room, user=user)
-            user_room.save()
+        user_room = RoomChatDatabase.update_sync(
+            "upsert_by_room", room=room, user_id=user.id
+        )
 
         ts_user = now_ts()
-        ChatHistoryModel(
-            text=text,
-            role="user",
-            user=user,
-            room=user_room,
-            is_image=False,
-            links=[],
-        ).save()
+        chat_history_buffer.add(
+            ChatHistoryModel(
+                text=text,
+                role="user",
+                room=user_room,
+                is_image=False,
+                links=[],
+            )
+        )
 
         file_bytes: bytes | None = None
         if docs is not None:
@@ -99,18 +122,17 @@ class ChatBotController:
 
         ts_assistant = now_ts()
 
-        ChatHistoryModel(
-            text=bot_text,
-            role="assistant",
-            user=user,
-            room=user_room,
-            is_image=is_image,
-            links=[],
-        ).save()
-
-        histories = (
-            ChatHistoryModel.objects(room=user_room, user=user).order_by("id").limit(10)
+        chat_history_buffer.add(
+            ChatHistoryModel(
+                text=bot_text,
+                role="assistant",
+                room=user_room,
+                is_image=is_image,
+                links=[],
+            )
         )
+
+        histories = chat_history_buffer.first_for_room(user_room)
         context_list = [f"{h.role}: {h.text}" for h in histories]
 
         if context_list:
@@ -118,51 +140,12 @@ class ChatBotController:
             user_room.title = title_room
             user_room.save()
 
-        latest_rooms = ChatRoomModel.objects(user=user, deleted_at=None)
-
-        room_items = [self.room_chat_serializer.serialize(r) for r in latest_rooms]
-        room_items.reverse()
-        socket_io.emit(
-            "chat",
-            {"type": "system_clear", "ts": now_ts()},
-            to=room,
-            namespace=self.NAMESPACE,
-        )
-        socket_io.emit(
-            "chat",
-            {
-                "type": "user",
-                "text": text,
-                "ts": ts_user,
-                "is_image": False,
-            },
-            to=room,
-            namespace=self.NAMESPACE,
-        )
+        room_item = self.room_chat_serializer.serialize(user_room)
         socket_io.emit(
             "chat",
-            {
-                "type": "assistant",
-                "text": bot_text,
-                "ts": ts_assistant,
-                "is_image": is_image,
-            },
-            to=room,
-            namespace=self.NAMESPACE,
-        )
-        socket_io.emit(
-            "rooms_updated",
-            {
-                "rooms": room_items,
-            },
-            to=room,
-            namespace=self.NAMESPACE,
-        )
-
-        return jsonify(
-            {
-                "message": "success create message",
-                "data": [
+            chat_batch(
+                [
+                    {"type": "system_clear", "ts": now_ts()},
                     {
                         "type": "user",
                         "text": text,
@@ -175,7 +158,35 @@ class ChatBotController:
                         "ts": ts_assistant,
                         "is_image": is_image,
                     },
-                ],
-                "rooms_updated": room_items,
-            }
+                ]
+            ),
+            to=room,
+            namespace=self.NAMESPACE,
+        )
+        socket_io.emit(
+            "room_upserted",
+            {
+                "room": room_item,
+            },
+            to=user_channel(user.id),
+            namespace=self.NAMESPACE,
         )
+
+        return {
+            "message": "success create message",
+            "data": [
+                {
+                    "type": "user",
+                    "text": text,
+                    "ts": ts_user,
+                    "is_image": False,
+                },
+                {
+                    "type": "assistant",
+                    "text": bot_text,
+                    "ts": ts_assistant,
+                    "is_image": is_image,
+                },
+            ],
+            "room_upserted": room_item,
+        }
@@ -3,10 +3,12 @@ from flask import jsonify
 from ..utils import (
     Validation,
     GeminiAI,
+    user_channel,
 )
 import uuid
 from ..serializers import ChatHistorySerializer, RoomChatSerializer
 import google.genai.errors
+from .. import socket_io
 
 
 class ChatRoomController:
@@ -35,7 +37,15 @@ class ChatRoomController:
             )
         ):
             return jsonify({"message": "chat rooms not found"}), 404
+        removed_rooms = [room.room for room in data_rooms]
         await RoomChatDatabase.delete(
             "delete_all_rooms_by_user_id", user_id=f"{user.id}"
         )
+        for room in removed_rooms:
+            socket_io.emit(
+                "room_removed",
+                {"room": room},
+                to=user_channel(user.id),
+                namespace="/chat-bot",
+            )
         return jsonify({"message": "successfully clear all chat rooms"}), 201
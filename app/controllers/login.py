@@ -2,21 +2,25 @@ from ..databases import (
     UserDatabase,
     AccountActiveDatabase,
     BlacklistTokenDatabase,
+    RefreshTokenDatabase,
 )
 from flask import jsonify
-import requests
 from ..utils import (
     AuthJwt,
     TokenAccountActive,
     SendEmail,
     Validation,
     generate_otp,
+    token_auth_cache,
+    revocation_key,
+    password_hasher,
+    google_identity,
 )
 import datetime
 from ..config import web_short_me
 from ..serializers import UserSerializer, TokenSerializer
-from ..dataclasses import AccessTokenSchema
 import traceback
+from .. import revocation_filter
 
 
 class LoginController:
@@ -25,8 +29,14 @@ class LoginController:
         self.token_serializer = TokenSerializer()
 
     async def user_logout(self, user, token):
+        jti = revocation_key(token)
         if not (
-            user_token := await BlacklistTokenDatabase.insert(user.id, token["iat"])
+            user_token := await BlacklistTokenDatabase.insert(
+                user.id,
+                token["iat"],
+                jti,
+                datetime.datetime.fromtimestamp(token["exp"], datetime.timezone.utc),
+            )
         ):
             return (
                 jsonify(
@@ -36,12 +46,44 @@ class LoginController:
                 ),
                 401,
             )
+        if family := token.get("fam"):
+            await RefreshTokenDatabase.delete("by_family", family=family)
+        revocation_filter.add(jti)
+        token_auth_cache.invalidate_user(user.id)
         return jsonify({"message": "successfully logout"}), 201
 
-    async def user_login(self, provider, token, email, password, timestamp):
-        from ..extensions import bcrypt
+    async def refresh_token(self, refresh_token, timestamp):
+        if not (payload := await AuthJwt.verify_refresh_token_async(refresh_token)):
+            return jsonify({"message": "invalid or expired token"}), 401
+        if not (
+            await RefreshTokenDatabase.update(
+                "rotate", jti=payload["jti"], used_at=timestamp
+            )
+        ):
+            await RefreshTokenDatabase.delete("by_family", family=payload["fam"])
+            return jsonify({"message": "invalid or expired token"}), 401
+        user_data = await UserDatabase.get("by_user_id", user_id=payload["sub"])
+        if not user_data or not user_data.is_active:
+            return jsonify({"message": "invalid or expired token"}), 401
+        token_model = await AuthJwt.generate_token_pair_async(
+            payload["sub"],
+            timestamp,
+            payload["fam"],
+            token_version=user_data.token_version,
+        )
+        token_data = self.token_serializer.serialize(token_model)
+        return (
+            jsonify(
+                {
+                    "message": "token refreshed successfully",
+                    "token": token_data,
+                }
+            ),
+            201,
+        )
 
-        access_token = None
+    async def user_login(self, provider, token, email, password, timestamp):
+        token_model = None
 
         try:
             errors = {}
@@ -54,9 +96,7 @@ class LoginController:
                         jsonify({"errors": errors, "message": "validations error"}),
                         400,
                     )
-                url = f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={token}"
-                response = requests.get(url)
-                resp = response.json()
+                resp = google_identity.get_profile(token) or {}
                 try:
                     email = resp["email"]
                 except KeyError:
@@ -96,8 +136,8 @@ class LoginController:
                         ),
                         401,
                     )
-                access_token = await AuthJwt.generate_jwt_async(
-                    f"{user_data.id}", timestamp
+                token_model = await AuthJwt.generate_token_pair_async(
+                    f"{user_data.id}", timestamp, token_version=user_data.token_version
                 )
                 user_me = self.user_seliazer.serialize(user_data)
             else:
@@ -124,7 +164,9 @@ class LoginController:
                         ),
                         401,
                     )
-                if not bcrypt.check_password_hash(user_data.password, password):
+                if not password_hasher.check_password_hash(
+                    user_data.password, password
+                ):
                     return (
                         jsonify(
                             {
@@ -133,6 +175,12 @@ class LoginController:
                         ),
                         401,
                     )
+                if password_hasher.needs_rehash(user_data.password):
+                    await UserDatabase.update(
+                        "rehash_password",
+                        user_id=user_data.id,
+                        password=password_hasher.generate_password_hash(password),
+                    )
                 if not user_data.is_active:
                     expired_at = timestamp + datetime.timedelta(minutes=5)
                     token = await TokenAccountActive.insert(
@@ -187,11 +235,10 @@ class LoginController:
                     await AccountActiveDatabase.delete(
                         "by_user_id", user_id=user_data.id
                     )
-                access_token = await AuthJwt.generate_jwt_async(
-                    f"{user_data.id}", timestamp
+                token_model = await AuthJwt.generate_token_pair_async(
+                    f"{user_data.id}", timestamp, token_version=user_data.token_version
                 )
                 user_me = self.user_seliazer.serialize(user_data)
-            token_model = AccessTokenSchema(access_token, timestamp)
             token_data = self.token_serializer.serialize(token_model)
             return (
                 jsonify(
@@ -35,8 +35,12 @@ class OtpEmailController:
                     "message": "successfully send otp",
                     "data": {
                         "id": f"{data_otp.id}",
-                        "created_at": data_otp.created_at,
-                        "expired_at": data_otp.expired_at,
+                        "created_at": int(
+                            data_otp.created_at.replace(
+                                tzinfo=datetime.timezone.utc
+                            ).timestamp()
+                        ),
+                        "expired_at": int(expired_at.timestamp()),
                     },
                 }
             ),
@@ -1,12 +1,12 @@
 from ..databases import UserDatabase
 from flask import jsonify, send_from_directory, request, make_response
 from ..utils import SendEmail
-from email_validator import validate_email
+from email_validator import validate_email, EmailNotValidError
 from ..serializers import UserSerializer
 from werkzeug.utils import secure_filename
 import os
 import cloudinary.uploader
-from ..utils import generate_etag
+from ..utils import generate_etag, email_deliverability
 
 
 class ProfileController:
@@ -63,9 +63,13 @@ class ProfileController:
             if isinstance(email, str) and len(email) > 50:
                 errors.setdefault("email", []).append("TOO_LONG")
             try:
-                valid = validate_email(email)
+                valid = validate_email(email, check_deliverability=False)
                 email = valid.email
-            except:
+                if not email_deliverability.is_deliverable(
+                    valid.ascii_domain, valid.domain
+                ):
+                    errors.setdefault("email", []).append("IS_INVALID")
+            except EmailNotValidError:
                 errors.setdefault("email", []).append("IS_INVALID")
         if avatar:
             filename = secure_filename(avatar.filename)
@@ -1,17 +1,17 @@
 from ..databases import UserDatabase, AccountActiveDatabase
 from flask import jsonify, url_for
-import requests
 from ..utils import (
     TokenAccountActive,
     SendEmail,
     AuthJwt,
     Validation,
     generate_otp,
+    password_hasher,
+    google_identity,
 )
 import datetime
 from ..config import web_short_me
 from ..serializers import UserSerializer, TokenSerializer
-from ..dataclasses import AccessTokenSchema
 
 
 class RegisterController:
@@ -29,8 +29,6 @@ class RegisterController:
         confirm_password,
         timestamp,
     ):
-        from ..extensions import bcrypt
-
         access_token = None
         token_web = None
 
@@ -49,9 +47,7 @@ class RegisterController:
                         ),
                         400,
                     )
-                url = f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={token}"
-                response = requests.get(url)
-                resp = response.json()
+                resp = google_identity.get_profile(token) or {}
                 try:
                     username = resp["name"]
                     email = resp["email"]
@@ -78,16 +74,15 @@ class RegisterController:
                     provider, avatar, username, email, None
                 )
                 user_me = self.user_seliazer.serialize(user_data)
-                access_token = await AuthJwt.generate_jwt_async(
-                    f"{user_data.id}", timestamp
-                )
-                access_token_model = AccessTokenSchema(
-                    access_token=access_token, created_at=timestamp
+                access_token_model = await AuthJwt.generate_token_pair_async(
+                    f"{user_data.id}", timestamp, token_version=user_data.token_version
                 )
                 token_data = self.token_serializer.serialize(access_token_model)
             else:
                 await Validation.validate_username_async(errors, username)
-                await Validation.validate_email_async(errors, email)
+                await Validation.validate_email_async(
+                    errors, email, check_deliverability=True
+                )
                 await Validation.validate_password_async(
                     errors, password, confirm_password
                 )
@@ -101,9 +96,7 @@ class RegisterController:
                         ),
                         400,
                     )
-                result_password = bcrypt.generate_password_hash(password).decode(
-                    "utf-8"
-                )
+                result_password = password_hasher.generate_password_hash(password)
                 avatar = url_for(
                     "static", filename="images/default-avatar.webp", _external=True
                 )
@@ -5,6 +5,7 @@ from ..utils import (
     SendEmail,
     Validation,
     generate_etag,
+    password_hasher,
 )
 import datetime
 from ..config import web_short_me
@@ -58,8 +59,6 @@ class ResetPasswordController:
     async def user_reset_password_verification(
         self, token, new_password, confirm_password, timestamp
     ):
-        from ..extensions import bcrypt
-
         errors = {}
         await Validation.validate_token(errors, token, "email_token_reset_password")
         await Validation.validate_password(errors, new_password, confirm_password)
@@ -79,7 +78,7 @@ class ResetPasswordController:
                 ),
                 422,
             )
-        result_password = bcrypt.generate_password_hash(new_password).decode("utf-8")
+        result_password = password_hasher.generate_password_hash(new_password)
         await ResetPasswordDatabase.delete(
             "user_password_by_token_email",
             token=token,
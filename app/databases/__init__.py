@@ -6,3 +6,21 @@ from .blacklist_token import *
 from .otp_email import *
 from .chat_bot import *
 from .room_chat import *
+from .chat_history_store import *
+from .chat_history_buffer import *
+from .chat_history_spill import *
+from .refresh_token import *
+from .pymongo_async import AsyncMongo
+from ..config import database_driver
+
+if database_driver == "async":
+    from .pymongo_async import (
+        AsyncUserDatabase as UserDatabase,
+        AsyncAccountActiveDatabase as AccountActiveDatabase,
+        AsyncResetPasswordDatabase as ResetPasswordDatabase,
+        AsyncBlacklistTokenDatabase as BlacklistTokenDatabase,
+        AsyncOtpEmailDatabase as OtpEmailDatabase,
+        AsyncChatHistoryDatabase as ChatHistoryDatabase,
+        AsyncRoomChatDatabase as RoomChatDatabase,
+        AsyncRefreshTokenDatabase as RefreshTokenDatabase,
+    )
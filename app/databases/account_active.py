@@ -1,6 +1,8 @@
 from .database import Database
+from .user import modify_user
 from ..models import AccountActiveModel, UserModel
-from datetime import timezone
+from bson import ObjectId
+import datetime
 
 
 class AccountActiveDatabase(Database):
@@ -10,20 +12,17 @@ class AccountActiveDatabase(Database):
         if not data_user:
             return None
 
-        data_account_active = AccountActiveModel.objects(user=data_user).first()
-        if not data_account_active:
-            data_account_active = AccountActiveModel(
-                user=data_user,
-                token=token,
-                expired_at=expired_at,
-                otp=otp,
-            )
-        else:
-            data_account_active.otp = otp
-            data_account_active.token = token
-            data_account_active.expired_at = expired_at
-        data_account_active.save()
-
+        now = datetime.datetime.now(datetime.timezone.utc)
+        data_account_active = AccountActiveModel.objects(user=data_user.id).modify(
+            upsert=True,
+            new=True,
+            set__token=token,
+            set__otp=otp,
+            set__expired_at=expired_at,
+            set__updated_at=now,
+            set_on_insert__created_at=now,
+        )
+        data_account_active._data["user"] = data_user
         return data_account_active
 
     @staticmethod
@@ -32,43 +31,20 @@ class AccountActiveDatabase(Database):
         user_id = kwargs.get("user_id")
         created_at = kwargs.get("created_at")
         if category == "by_token":
-            if data_account_active := AccountActiveModel.objects(token=token).first():
-                if (
-                    data_account_active.expired_at.replace(tzinfo=timezone.utc)
-                    > created_at
-                ):
-                    return data_account_active
-                else:
-                    data_account_active.user.save()
-                    data_account_active.delete()
+            return AccountActiveModel.active(created_at, token=token)
         if category == "get_token_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                if data_account_active := AccountActiveModel.objects(
-                    user=user_data
-                ).first():
-                    if (
-                        data_account_active.expired_at.replace(tzinfo=timezone.utc)
-                        > created_at
-                    ):
-                        return data_account_active
-                    else:
-                        data_account_active.user.save()
-                        data_account_active.delete()
+            return AccountActiveModel.active(created_at, user=user_id)
 
     @staticmethod
     def get_sync(category, **kwargs):
         token = kwargs.get("token")
         created_at = kwargs.get("created_at")
         if category == "by_token":
-            if data_account_active := AccountActiveModel.objects(token=token).first():
-                if (
-                    data_account_active.expired_at.replace(tzinfo=timezone.utc)
-                    > created_at
-                ):
-                    return data_account_active
-                else:
-                    data_account_active.user.save()
-                    data_account_active.delete()
+            return (
+                AccountActiveModel.objects(expired_at__gt=created_at, token=token)
+                .no_dereference()
+                .first()
+            )
 
     @staticmethod
     async def delete(category, **kwargs):
@@ -80,13 +56,12 @@ class AccountActiveDatabase(Database):
         token = kwargs.get("token")
         otp = kwargs.get("otp")
         if category == "user_active_by_token":
-            if user_data := UserModel.objects(id=user_id).first():
-                if data_account_active := AccountActiveModel.objects(
-                    user=user_data, token=token, otp=otp
-                ).first():
-                    user_data.is_active = True
-                    user_data.save()
+            if data_account_active := AccountActiveModel.objects(
+                user=ObjectId(user_id), token=token, otp=otp
+            ).first():
+                if user_data := modify_user(user_id, set__is_active=True):
                     data_account_active.delete()
+                    data_account_active._data["user"] = user_data
                     return data_account_active
 
     @staticmethod
@@ -95,11 +70,10 @@ class AccountActiveDatabase(Database):
         token = kwargs.get("token")
         otp = kwargs.get("otp")
         if category == "user_active_by_token":
-            if user_data := UserModel.objects(id=user_id).first():
-                if data_account_active := AccountActiveModel.objects(
-                    user=user_data, token=token, otp=otp
-                ).first():
-                    user_data.is_active = True
-                    user_data.save()
+            if data_account_active := AccountActiveModel.objects(
+                user=ObjectId(user_id), token=token, otp=otp
+            ).first():
+                if user_data := modify_user(user_id, set__is_active=True):
                     data_account_active.delete()
+                    data_account_active._data["user"] = user_data
                     return data_account_active
@@ -1,14 +1,19 @@
 from .database import Database
-from ..models import BlacklistTokenModel, UserModel
+from ..models import BlacklistTokenModel
+from bson import ObjectId
 
 
 class BlacklistTokenDatabase(Database):
     @staticmethod
-    async def insert(user_id, created_at):
-        if user_data := UserModel.objects(id=user_id).first():
-            data_token = BlacklistTokenModel(user=user_data, created_at=created_at)
-            data_token.save()
-            return data_token
+    async def insert(user_id, created_at, jti=None, expired_at=None):
+        data_token = BlacklistTokenModel(
+            user=ObjectId(user_id),
+            created_at=created_at,
+            jti=jti or f"{user_id}:{created_at}",
+            expired_at=expired_at,
+        )
+        data_token.save()
+        return data_token
 
     @staticmethod
     async def get(category, **kwargs):
@@ -1,4 +1,5 @@
 from .database import Database
+from .chat_history_store import chat_history_store
 from ..models import UserModel, ChatHistoryModel, ChatRoomModel
 
 
@@ -17,7 +18,6 @@ class ChatHistoryDatabase(Database):
                 user_chat = ChatHistoryModel(
                     original_message=original_message,
                     response_message=response_message,
-                    user=user_data,
                     room=user_room,
                 )
                 user_chat.save()
@@ -28,20 +28,21 @@ class ChatHistoryDatabase(Database):
         user_id = kwargs.get("user_id")
         room_id = kwargs.get("room_id")
         if category == "get_chat_history_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                return ChatHistoryModel.objects(user=user_data, room_id=room_id).all()
+            if ChatRoomModel.objects(id=room_id, user=user_id).only("id").first():
+                return chat_history_store.messages(room_id)
+            return []
         if category == "get_all_rooms_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                if user_room := ChatRoomModel.objects(user=user_data).all():
-                    return user_room
+            if user_room := list(ChatRoomModel.objects(user=user_id).no_dereference()):
+                return user_room
 
     @staticmethod
     def get_sync(category, **kwargs):
         user_id = kwargs.get("user_id")
         room_id = kwargs.get("room_id")
         if category == "get_chat_history_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                return ChatHistoryModel.objects(user=user_data, room_id=room_id).all()
+            if ChatRoomModel.objects(id=room_id, user=user_id).only("id").first():
+                return chat_history_store.messages(room_id)
+            return []
 
     @staticmethod
     async def delete(category, **kwargs):
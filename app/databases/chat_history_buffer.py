@@ -0,0 +1,135 @@
+import atexit
+import logging
+import threading
+from bson import ObjectId
+from pymongo.errors import ConnectionFailure
+from .chat_history_store import chat_history_store
+
+
+class ChatHistoryWriteBehind:
+    def __init__(
+        self,
+        socket_io,
+        flush_interval=0.05,
+        max_batch=100,
+        max_retries=5,
+        on_error=None,
+        on_drop=None,
+        logger=None,
+    ):
+        self.socket_io = socket_io
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.on_error = on_error
+        self.on_drop = on_drop
+        self.logger = logger or logging.getLogger(__name__)
+        self.pending = []
+        self.attempts = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        atexit.register(self.stop)
+        self.socket_io.start_background_task(self._flush_loop)
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        self.flush()
+
+    def add(self, document):
+        document.id = document.id or ObjectId()
+        document.validate()
+        with self.lock:
+            self.pending.append(document)
+            size = len(self.pending)
+        if not self.running:
+            self.start()
+        if size >= self.max_batch:
+            self.wakeup.set()
+        return document
+
+    def pending_for(self, room):
+        with self.lock:
+            return [document for document in self.pending if document.room == room]
+
+    def first_for_room(self, room, limit=10):
+        pending = self.pending_for(room)
+        histories = chat_history_store.messages(room, limit=limit)
+        if len(histories) < limit:
+            stored_ids = {history.id for history in histories}
+            histories.extend(
+                document for document in pending if document.id not in stored_ids
+            )
+        return histories[:limit]
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return 0
+        try:
+            failed = chat_history_store.insert_many(batch)
+        except ConnectionFailure as e:
+            # Part of the batch may have been written. Retrying is safe: those
+            # messages fail as duplicate keys, or in the bucket layout are
+            # pushed again and deduplicated on read.
+            self._report_error(batch, e)
+            self._requeue(batch)
+            return 0
+        except Exception as e:
+            self._report_error(batch, e)
+            failed = batch
+        self._retry(batch, failed)
+        return len(batch) - len(failed)
+
+    def _report_error(self, batch, error):
+        self.logger.error(
+            "chat history flush of %d messages failed",
+            len(batch),
+            exc_info=error,
+        )
+        if self.on_error is not None:
+            self.on_error(batch, error)
+
+    def _requeue(self, documents):
+        with self.lock:
+            self.pending[:0] = documents
+
+    def _retry(self, batch, failed):
+        failed_ids = {document.id for document in failed}
+        retry, dropped = [], []
+        with self.lock:
+            for document in batch:
+                if document.id not in failed_ids:
+                    self.attempts.pop(document.id, None)
+            for document in failed:
+                attempts = self.attempts.get(document.id, 0) + 1
+                if attempts > self.max_retries:
+                    del self.attempts[document.id]
+                    dropped.append(document)
+                else:
+                    self.attempts[document.id] = attempts
+                    retry.append(document)
+        self._requeue(retry)
+        if dropped:
+            self.logger.error(
+                "dropped %d chat history messages after %d retries: %s",
+                len(dropped),
+                self.max_retries,
+                ", ".join(str(document.id) for document in dropped),
+            )
+            if self.on_drop is not None:
+                self.on_drop(dropped)
+
+    def _flush_loop(self):
+        while self.running:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
@@ -0,0 +1,49 @@
+import os
+import threading
+from bson import json_util
+from ..models import ChatHistoryModel
+
+CHAT_HISTORY_SPILL_FILE = "chat_history_dropped.jsonl"
+
+
+class ChatHistorySpill:
+    """Appends messages the write-behind buffer gave up on to a JSON lines file.
+
+    `flask chat-history restore-dropped` writes them back once the database
+    accepts them again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, documents):
+        lines = "".join(
+            json_util.dumps(document.to_mongo()) + "\n" for document in documents
+        )
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return []
+        with self.lock, open(self.path, encoding="utf-8") as f:
+            return [
+                ChatHistoryModel._from_son(json_util.loads(line))
+                for line in f
+                if line.strip()
+            ]
+
+    def replace(self, documents):
+        with self.lock:
+            if not documents:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                for document in documents:
+                    f.write(json_util.dumps(document.to_mongo()) + "\n")
+            os.replace(temporary, self.path)
@@ -0,0 +1,139 @@
+import heapq
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from ..config import chat_history_layout, chat_history_bucket_size
+from ..models import ChatHistoryModel, ChatHistoryBucketModel, ChatMessage
+
+DUPLICATE_KEY = 11000
+
+
+def bucket_message(document):
+    return ChatMessage(
+        id=document.id,
+        text=document.text,
+        links=document.links,
+        role=document.role,
+        is_image=document.is_image,
+    ).to_mongo()
+
+
+def message_document(message, room):
+    message = ChatMessage._from_son(message)
+    return ChatHistoryModel(
+        id=message.id,
+        text=message.text,
+        links=message.links,
+        role=message.role,
+        is_image=message.is_image,
+        room=room,
+    )
+
+
+def bucket_messages(buckets, limit=None):
+    # A bucket's _id is the id of the message that opened it, and later
+    # messages only go to the room's open bucket, so no message in a bucket is
+    # older than its _id (restore-dropped is the exception, it appends old
+    # messages to the open bucket). Reading buckets in _id order can therefore
+    # stop once limit messages are held that all precede the next bucket.
+    # Keying by message id drops copies pushed again by a retried flush.
+    messages = {}
+    messages_field = ChatHistoryBucketModel.messages.db_field
+    for bucket in buckets:
+        if (
+            limit
+            and len(messages) >= limit
+            and heapq.nsmallest(limit, messages)[-1] < bucket["_id"]
+        ):
+            break
+        for message in bucket.get(messages_field, []):
+            messages.setdefault(message["_id"], message)
+    ordered = [messages[key] for key in sorted(messages)]
+    return ordered[:limit] if limit else ordered
+
+
+class DocumentChatHistoryStore:
+    """One ChatHistoryModel document per message.
+
+    insert_many returns the documents that were not written. A duplicate key
+    means an earlier attempt already wrote the message, so it counts as done.
+    """
+
+    def insert_many(self, documents):
+        try:
+            ChatHistoryModel._get_collection().insert_many(
+                [document.to_mongo() for document in documents], ordered=False
+            )
+        except BulkWriteError as e:
+            failed = {
+                error["index"]
+                for error in e.details["writeErrors"]
+                if error["code"] != DUPLICATE_KEY
+            }
+            return [documents[index] for index in sorted(failed)]
+        return []
+
+    def messages(self, room, limit=None, fields=None):
+        queryset = ChatHistoryModel.objects(room=room).no_dereference().order_by("id")
+        if fields:
+            queryset = queryset.only(*fields)
+        if limit:
+            queryset = queryset.limit(limit)
+        return list(queryset)
+
+
+class BucketChatHistoryStore:
+    """Up to bucket_size messages per ChatHistoryBucketModel, appended with $push."""
+
+    def __init__(self, bucket_size=100):
+        self.bucket_size = bucket_size
+
+    def append(self, document):
+        message = bucket_message(document)
+        return UpdateOne(
+            ChatHistoryBucketModel.objects(
+                room=document.room, count__lt=self.bucket_size, closed__ne=True
+            )._query,
+            {
+                "$push": {ChatHistoryBucketModel.messages.db_field: message},
+                "$inc": {ChatHistoryBucketModel.count.db_field: 1},
+                "$setOnInsert": {"_id": message["_id"]},
+            },
+            upsert=True,
+        )
+
+    def insert_many(self, documents):
+        # Ordered, so messages fill buckets in order. The first error stops the
+        # batch: everything before it is written and everything after it is not.
+        try:
+            ChatHistoryBucketModel._get_collection().bulk_write(
+                [self.append(document) for document in documents], ordered=True
+            )
+        except BulkWriteError as e:
+            error = e.details["writeErrors"][0]
+            return documents[error["index"] + (error["code"] == DUPLICATE_KEY) :]
+        return []
+
+    def messages(self, room, limit=None, fields=None):
+        only = ["messages"]
+        if fields:
+            only = [
+                f"messages.{name}"
+                for name in {"id", *fields}
+                if name in ChatMessage._fields
+            ]
+        buckets = (
+            ChatHistoryBucketModel.objects(room=room)
+            .order_by("id")
+            .only(*only)
+            .as_pymongo()
+        )
+        return [
+            message_document(message, room)
+            for message in bucket_messages(buckets, limit)
+        ]
+
+
+if chat_history_layout == "bucket":
+    chat_history_store = BucketChatHistoryStore(chat_history_bucket_size)
+else:
+    chat_history_store = DocumentChatHistoryStore()
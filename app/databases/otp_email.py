@@ -1,26 +1,22 @@
 from .database import Database
-from ..models import OtpEmailModel, UserModel
+from ..models import OtpEmailModel
+from bson import ObjectId
+import datetime
 
 
 class OtpEmailDatabase(Database):
     @staticmethod
     async def insert(user_id, otp, created_at, expired_at):
-        if data_user := UserModel.objects(id=user_id).first():
-            if data_otp := OtpEmailModel.objects(user=data_user).first():
-                data_otp.otp = otp
-                data_otp.updated_at = int(created_at)
-                data_otp.expired_at = int(expired_at)
-                data_otp.save()
-                return data_otp
-            otp_email_data = OtpEmailModel(
-                user=data_user,
-                otp=otp,
-                created_at=int(created_at),
-                updated_at=int(created_at),
-                expired_at=int(expired_at),
-            )
-            otp_email_data.save()
-            return otp_email_data
+        created_at = datetime.datetime.fromtimestamp(created_at, datetime.timezone.utc)
+        expired_at = datetime.datetime.fromtimestamp(expired_at, datetime.timezone.utc)
+        return OtpEmailModel.objects(user=ObjectId(user_id)).modify(
+            upsert=True,
+            new=True,
+            set__otp=otp,
+            set__expired_at=expired_at,
+            set__updated_at=datetime.datetime.now(datetime.timezone.utc),
+            set_on_insert__created_at=created_at,
+        )
 
     @staticmethod
     async def get(category, **kwargs):
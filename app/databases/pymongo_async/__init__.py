@@ -0,0 +1,9 @@
+from .client import AsyncMongo
+from .user import *
+from .account_active import *
+from .reset_password import *
+from .blacklist_token import *
+from .otp_email import *
+from .chat_bot import *
+from .room_chat import *
+from .refresh_token import *
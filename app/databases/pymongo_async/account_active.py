@@ -0,0 +1,63 @@
+from ..account_active import AccountActiveDatabase
+from ...models import AccountActiveModel, UserModel
+from .client import on_mongo_loop, modify, find_one, attach_user, delete_document
+from .user import modify_user
+from bson import ObjectId
+import datetime
+
+
+class AsyncAccountActiveDatabase(AccountActiveDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(email, token, otp, expired_at):
+        data_user = await find_one(UserModel, email=email.lower())
+        if not data_user:
+            return None
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        data_account_active = await modify(
+            AccountActiveModel,
+            {"user": data_user.id},
+            upsert=True,
+            set__token=token,
+            set__otp=otp,
+            set__expired_at=expired_at,
+            set__updated_at=now,
+            set_on_insert__created_at=now,
+        )
+        data_account_active._data["user"] = data_user
+        return data_account_active
+
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        token = kwargs.get("token")
+        user_id = kwargs.get("user_id")
+        created_at = kwargs.get("created_at")
+        if category == "by_token":
+            return await attach_user(
+                await find_one(
+                    AccountActiveModel, expired_at__gt=created_at, token=token
+                )
+            )
+        if category == "get_token_by_user_id":
+            return await attach_user(
+                await find_one(
+                    AccountActiveModel, expired_at__gt=created_at, user=user_id
+                )
+            )
+
+    @staticmethod
+    @on_mongo_loop
+    async def update(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        token = kwargs.get("token")
+        otp = kwargs.get("otp")
+        if category == "user_active_by_token":
+            if data_account_active := await find_one(
+                AccountActiveModel, user=ObjectId(user_id), token=token, otp=otp
+            ):
+                if user_data := await modify_user(user_id, set__is_active=True):
+                    await delete_document(data_account_active)
+                    data_account_active._data["user"] = user_data
+                    return data_account_active
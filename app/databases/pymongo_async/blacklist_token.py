@@ -0,0 +1,17 @@
+from ..blacklist_token import BlacklistTokenDatabase
+from ...models import BlacklistTokenModel
+from .client import on_mongo_loop, insert_document
+from bson import ObjectId
+
+
+class AsyncBlacklistTokenDatabase(BlacklistTokenDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(user_id, created_at, jti=None, expired_at=None):
+        data_token = BlacklistTokenModel(
+            user=ObjectId(user_id),
+            created_at=created_at,
+            jti=jti or f"{user_id}:{created_at}",
+            expired_at=expired_at,
+        )
+        return await insert_document(data_token)
@@ -0,0 +1,30 @@
+from ..chat_bot import ChatHistoryDatabase
+from ..chat_history_store import bucket_messages, message_document
+from ...config import chat_history_layout
+from ...models import ChatHistoryModel, ChatHistoryBucketModel, ChatRoomModel
+from .client import on_mongo_loop, collection, query, find, find_one
+
+
+class AsyncChatHistoryDatabase(ChatHistoryDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        room_id = kwargs.get("room_id")
+        if category == "get_chat_history_by_user_id":
+            if not await find_one(ChatRoomModel, id=room_id, user=user_id):
+                return []
+            if chat_history_layout != "bucket":
+                return await find(ChatHistoryModel, sort=("id",), room=room_id)
+            cursor = collection(ChatHistoryBucketModel).find(
+                query(ChatHistoryBucketModel, room=room_id),
+                {ChatHistoryBucketModel.messages.db_field: 1},
+                sort=[("_id", 1)],
+            )
+            return [
+                message_document(message, room_id)
+                for message in bucket_messages([bucket async for bucket in cursor])
+            ]
+        if category == "get_all_rooms_by_user_id":
+            if user_room := await find(ChatRoomModel, user=user_id):
+                return user_room
@@ -0,0 +1,228 @@
+from mongoengine import signals, NotUniqueError
+from mongoengine.queryset import QuerySet
+from mongoengine.queryset.transform import update as transform_update
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import asyncio
+import contextvars
+import datetime
+import functools
+import threading
+from eventlet import patcher
+
+
+class AsyncMongo:
+    """Owns one AsyncMongoClient and the event loop it is bound to.
+
+    Flask runs every async view on a fresh event loop, and an AsyncMongoClient
+    may only be used from the loop that first touched it. The client therefore
+    lives on a dedicated loop thread and repository coroutines are handed to
+    it, so its connection pool is shared by all requests and their I/O
+    overlaps on that loop.
+    """
+
+    def __init__(self, host, db=None):
+        self.host = host
+        self.db = db
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._loop is None:
+                # Under eventlet's monkey patching threading.Thread is a green
+                # thread and selectors are green too, so the loop would block
+                # the hub. Run it on a real OS thread with the original
+                # selector instead.
+                selectors = patcher.import_patched(
+                    "selectors", ("select", patcher.original("select"))
+                )
+                loop = asyncio.SelectorEventLoop(selectors.DefaultSelector())
+                patcher.original("threading").Thread(
+                    target=loop.run_forever, name="async-mongo", daemon=True
+                ).start()
+                self._client = AsyncMongoClient(self.host)
+                self._loop = loop
+        return self._loop
+
+    @property
+    def database(self):
+        self.loop
+        if self.db:
+            return self._client[self.db]
+        return self._client.get_default_database()
+
+    async def run(self, coro):
+        loop = self.loop
+        caller = asyncio.get_running_loop()
+        if caller is loop:
+            return await coro
+        # concurrent.futures waits on a threading.Condition, which eventlet
+        # turns green and which then cannot be woken from the mongo thread.
+        # Hand the coroutine over and its outcome back with
+        # call_soon_threadsafe only.
+        context = contextvars.copy_context()
+        future = caller.create_future()
+        tasks = []
+
+        def settle(task):
+            if future.cancelled():
+                return
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def start():
+            task = loop.create_task(in_context(context, coro))
+            task.add_done_callback(
+                lambda task: caller.call_soon_threadsafe(settle, task)
+            )
+            tasks.append(task)
+
+        loop.call_soon_threadsafe(start)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            loop.call_soon_threadsafe(lambda: tasks and tasks[0].cancel())
+            raise
+
+    def close(self, timeout=5):
+        with self._lock:
+            if self._loop is None:
+                return
+            loop, client = self._loop, self._client
+            closed = patcher.original("threading").Event()
+
+            async def shutdown():
+                try:
+                    await client.close()
+                finally:
+                    loop.stop()
+                    closed.set()
+
+            loop.call_soon_threadsafe(lambda: loop.create_task(shutdown()))
+            closed.wait(timeout)
+            self._loop = self._client = None
+
+
+async def in_context(context, coro):
+    # Tasks on the mongo loop start from that thread's context; carry the
+    # caller's variables over so per-request state such as the query counter
+    # still applies.
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+def on_mongo_loop(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        from ... import async_mongo
+
+        return await async_mongo.run(func(*args, **kwargs))
+
+    return wrapper
+
+
+def collection(model):
+    from ... import async_mongo
+
+    return async_mongo.database[model._get_collection_name()]
+
+
+def query(model, **kwargs):
+    return QuerySet(model, None).filter(**kwargs)._query
+
+
+def ordering(model, *keys):
+    return QuerySet(model, None).order_by(*keys)._ordering
+
+
+def update(model, **kwargs):
+    return transform_update(model, **kwargs)
+
+
+def load(model, son):
+    if son:
+        return model._from_son(son, created=False)
+
+
+async def find_one(model, sort=None, **kwargs):
+    son = await collection(model).find_one(
+        query(model, **kwargs), sort=ordering(model, *sort) if sort else None
+    )
+    return load(model, son)
+
+
+async def find(model, sort=None, **kwargs):
+    cursor = collection(model).find(query(model, **kwargs))
+    if sort:
+        cursor = cursor.sort(ordering(model, *sort))
+    return [load(model, son) async for son in cursor]
+
+
+async def modify(model, filters, upsert=False, **kwargs):
+    return load(
+        model,
+        await collection(model).find_one_and_update(
+            query(model, **filters),
+            update(model, **kwargs),
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER,
+        ),
+    )
+
+
+async def attach_user(document):
+    from ...models import UserModel
+
+    if document and (user := document._data.get("user")) is not None:
+        if not isinstance(user, UserModel):
+            document._data["user"] = await find_one(UserModel, id=user.id)
+    return document
+
+
+async def insert_document(document):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if not document.created_at:
+        document.created_at = now
+    document.updated_at = now
+    document.validate()
+    try:
+        result = await collection(type(document)).insert_one(document.to_mongo())
+    except DuplicateKeyError as e:
+        raise NotUniqueError(str(e))
+    document.pk = result.inserted_id
+    document._clear_changed_fields()
+    document._created = False
+    signals.post_save.send(type(document), document=document, created=True)
+    return document
+
+
+async def save_document(document):
+    document.updated_at = datetime.datetime.now(datetime.timezone.utc)
+    document.validate()
+    sets, unsets = document._delta()
+    changes = {}
+    if sets:
+        changes["$set"] = sets
+    if unsets:
+        changes["$unset"] = unsets
+    if changes:
+        try:
+            await collection(type(document)).update_one({"_id": document.pk}, changes)
+        except DuplicateKeyError as e:
+            raise NotUniqueError(str(e))
+    document._clear_changed_fields()
+    signals.post_save.send(type(document), document=document, created=False)
+    return document
+
+
+async def delete_document(document):
+    await collection(type(document)).delete_one({"_id": document.pk})
+    return document
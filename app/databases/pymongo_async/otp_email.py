@@ -0,0 +1,22 @@
+from ..otp_email import OtpEmailDatabase
+from ...models import OtpEmailModel
+from .client import on_mongo_loop, modify
+from bson import ObjectId
+import datetime
+
+
+class AsyncOtpEmailDatabase(OtpEmailDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(user_id, otp, created_at, expired_at):
+        created_at = datetime.datetime.fromtimestamp(created_at, datetime.timezone.utc)
+        expired_at = datetime.datetime.fromtimestamp(expired_at, datetime.timezone.utc)
+        return await modify(
+            OtpEmailModel,
+            {"user": ObjectId(user_id)},
+            upsert=True,
+            set__otp=otp,
+            set__expired_at=expired_at,
+            set__updated_at=datetime.datetime.now(datetime.timezone.utc),
+            set_on_insert__created_at=created_at,
+        )
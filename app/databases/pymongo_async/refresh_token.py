@@ -0,0 +1,56 @@
+from ..refresh_token import RefreshTokenDatabase
+from ...models import RefreshTokenModel
+from .client import (
+    on_mongo_loop,
+    collection,
+    query,
+    modify,
+    find_one,
+    insert_document,
+)
+from bson import ObjectId
+
+
+class AsyncRefreshTokenDatabase(RefreshTokenDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(user_id, jti, family, expired_at):
+        data_token = RefreshTokenModel(
+            user=ObjectId(user_id), jti=jti, family=family, expired_at=expired_at
+        )
+        return await insert_document(data_token)
+
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        jti = kwargs.get("jti")
+        if category == "by_jti":
+            return await find_one(RefreshTokenModel, jti=jti)
+
+    @staticmethod
+    @on_mongo_loop
+    async def delete(category, **kwargs):
+        family = kwargs.get("family")
+        user_id = kwargs.get("user_id")
+        if category == "by_family":
+            result = await collection(RefreshTokenModel).delete_many(
+                query(RefreshTokenModel, family=family)
+            )
+            return result.deleted_count
+        if category == "by_user_id":
+            result = await collection(RefreshTokenModel).delete_many(
+                query(RefreshTokenModel, user=user_id)
+            )
+            return result.deleted_count
+
+    @staticmethod
+    @on_mongo_loop
+    async def update(category, **kwargs):
+        jti = kwargs.get("jti")
+        used_at = kwargs.get("used_at")
+        if category == "rotate":
+            return await modify(
+                RefreshTokenModel,
+                {"jti": jti, "used_at": None},
+                set__used_at=used_at,
+            )
@@ -0,0 +1,64 @@
+from ..reset_password import ResetPasswordDatabase
+from ...models import ResetPasswordModel, UserModel, RefreshTokenModel
+from .client import (
+    on_mongo_loop,
+    collection,
+    query,
+    modify,
+    find_one,
+    attach_user,
+    delete_document,
+)
+from .user import modify_user
+from bson import ObjectId
+import datetime
+
+
+class AsyncResetPasswordDatabase(ResetPasswordDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(email, token, expired_at):
+        if data_user := await find_one(UserModel, email=email.lower()):
+            now = datetime.datetime.now(datetime.timezone.utc)
+            reset_password_data = await modify(
+                ResetPasswordModel,
+                {"user": data_user.id},
+                upsert=True,
+                set__token=token,
+                set__expired_at=expired_at,
+                set__updated_at=now,
+                set_on_insert__created_at=now,
+            )
+            reset_password_data._data["user"] = data_user
+            return reset_password_data
+
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        token = kwargs.get("token")
+        created_at = kwargs.get("created_at")
+        if category in ("by_token_web", "by_token_email"):
+            return await attach_user(
+                await find_one(
+                    ResetPasswordModel, expired_at__gt=created_at, token=token
+                )
+            )
+
+    @staticmethod
+    @on_mongo_loop
+    async def delete(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        new_password = kwargs.get("new_password")
+        if category == "user_password_by_token_email":
+            if data_reset_password := await find_one(
+                ResetPasswordModel, user=ObjectId(user_id)
+            ):
+                if user_data := await modify_user(
+                    user_id, set__password=new_password, inc__token_version=1
+                ):
+                    await collection(RefreshTokenModel).delete_many(
+                        query(RefreshTokenModel, user=user_data.id)
+                    )
+                    await delete_document(data_reset_password)
+                    data_reset_password._data["user"] = user_data
+                    return data_reset_password
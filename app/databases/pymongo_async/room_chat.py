@@ -0,0 +1,28 @@
+from ..room_chat import RoomChatDatabase
+from ...models import ChatRoomModel, ChatHistoryModel, ChatHistoryBucketModel
+from .client import on_mongo_loop, collection, query, find
+
+
+class AsyncRoomChatDatabase(RoomChatDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        if category == "get_all_rooms_by_user_id":
+            if user_rooms := await find(ChatRoomModel, sort=("-id",), user=user_id):
+                return user_rooms
+
+    @staticmethod
+    @on_mongo_loop
+    async def delete(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        if category == "delete_all_rooms_by_user_id":
+            if user_rooms := await find(ChatRoomModel, user=user_id):
+                room_ids = [room.id for room in user_rooms]
+                # Chat history cascades on room, which a raw delete skips.
+                for model in (ChatHistoryModel, ChatHistoryBucketModel):
+                    await collection(model).delete_many(query(model, room__in=room_ids))
+                await collection(ChatRoomModel).delete_many(
+                    query(ChatRoomModel, id__in=room_ids)
+                )
+                return user_rooms
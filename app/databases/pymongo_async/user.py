@@ -0,0 +1,96 @@
+from ..user import UserDatabase
+from ...models import UserModel, RefreshTokenModel
+from .client import (
+    on_mongo_loop,
+    collection,
+    query,
+    update,
+    modify,
+    find_one,
+    insert_document,
+    save_document,
+)
+from mongoengine import signals
+import datetime
+
+
+async def modify_user(user_id, **kwargs):
+    if user_data := await modify(
+        UserModel,
+        {"id": user_id},
+        set__updated_at=datetime.datetime.now(datetime.timezone.utc),
+        **kwargs,
+    ):
+        signals.post_save.send(UserModel, document=user_data, created=False)
+    return user_data
+
+
+class AsyncUserDatabase(UserDatabase):
+    @staticmethod
+    @on_mongo_loop
+    async def insert(
+        provider,
+        avatar,
+        username,
+        email,
+        password,
+    ):
+        user_data = UserModel(
+            email=email,
+            username=username,
+            password=password,
+            provider=provider,
+            avatar=avatar,
+        )
+        if provider == "google":
+            user_data.is_active = True
+        await user_data.unique_field()
+        return await insert_document(user_data)
+
+    @staticmethod
+    @on_mongo_loop
+    async def update(category, **kwargs):
+        user_id = kwargs.get("user_id")
+        password = kwargs.get("password")
+        email = kwargs.get("email")
+        created_at = kwargs.get("created_at")
+        deleted_id = kwargs.get("deleted_id")
+        avatar = kwargs.get("avatar")
+        if category == "rehash_password":
+            result = await collection(UserModel).update_one(
+                query(UserModel, id=user_id), update(UserModel, set__password=password)
+            )
+            return result.modified_count
+        if category == "password":
+            if user_data := await modify_user(
+                user_id, set__password=password, inc__token_version=1
+            ):
+                await collection(RefreshTokenModel).delete_many(
+                    query(RefreshTokenModel, user=user_data.id)
+                )
+            return user_data
+        if user_data := await find_one(UserModel, id=user_id):
+            if category == "profile":
+                if email:
+                    user_data.email = email
+                if avatar:
+                    user_data.avatar = avatar
+                await user_data.unique_field()
+                return await save_document(user_data)
+            if category == "deleted_id_by_user_id":
+                user_data.deleted_id = deleted_id
+                user_data.updated_at = created_at
+                return await save_document(user_data)
+            if category == "cancle_deleted_id_by_user_id":
+                user_data.deleted_id = None
+                return await save_document(user_data)
+
+    @staticmethod
+    @on_mongo_loop
+    async def get(category, **kwargs):
+        email = kwargs.get("email")
+        user_id = kwargs.get("user_id")
+        if category == "by_email":
+            return await find_one(UserModel, email=email.lower())
+        if category == "by_user_id":
+            return await find_one(UserModel, id=user_id)
@@ -0,0 +1,37 @@
+from .database import Database
+from ..models import RefreshTokenModel
+from bson import ObjectId
+
+
+class RefreshTokenDatabase(Database):
+    @staticmethod
+    async def insert(user_id, jti, family, expired_at):
+        data_token = RefreshTokenModel(
+            user=ObjectId(user_id), jti=jti, family=family, expired_at=expired_at
+        )
+        data_token.save()
+        return data_token
+
+    @staticmethod
+    async def get(category, **kwargs):
+        jti = kwargs.get("jti")
+        if category == "by_jti":
+            return RefreshTokenModel.objects(jti=jti).first()
+
+    @staticmethod
+    async def delete(category, **kwargs):
+        family = kwargs.get("family")
+        user_id = kwargs.get("user_id")
+        if category == "by_family":
+            return RefreshTokenModel.objects(family=family).delete()
+        if category == "by_user_id":
+            return RefreshTokenModel.objects(user=user_id).delete()
+
+    @staticmethod
+    async def update(category, **kwargs):
+        jti = kwargs.get("jti")
+        used_at = kwargs.get("used_at")
+        if category == "rotate":
+            return RefreshTokenModel.objects(jti=jti, used_at=None).modify(
+                set__used_at=used_at, new=True
+            )
@@ -1,57 +1,32 @@
 from .database import Database
-from ..models import ResetPasswordModel, UserModel
-from datetime import timezone
+from .user import modify_user
+from ..models import ResetPasswordModel, UserModel, RefreshTokenModel
+from bson import ObjectId
+import datetime
 
 
 class ResetPasswordDatabase(Database):
     @staticmethod
-    async def insert(email, token_web, token_email, expired_at):
+    async def insert(email, token, expired_at):
         if data_user := UserModel.objects(email=email.lower()).first():
-            if data_account_active := ResetPasswordModel.objects(
-                user=data_user
-            ).first():
-                data_account_active.token_web = token_web
-                data_account_active.token_email = token_email
-                data_account_active.expired_at = expired_at
-                data_account_active.save()
-                return data_account_active
-            account_active_data = ResetPasswordModel(
-                user=data_user,
-                token_web=token_web,
-                token_email=token_email,
-                expired_at=expired_at,
+            now = datetime.datetime.now(datetime.timezone.utc)
+            reset_password_data = ResetPasswordModel.objects(user=data_user.id).modify(
+                upsert=True,
+                new=True,
+                set__token=token,
+                set__expired_at=expired_at,
+                set__updated_at=now,
+                set_on_insert__created_at=now,
             )
-            account_active_data.save()
-            return account_active_data
+            reset_password_data._data["user"] = data_user
+            return reset_password_data
 
     @staticmethod
     async def get(category, **kwargs):
         token = kwargs.get("token")
         created_at = kwargs.get("created_at")
-        if category == "by_token_web":
-            if data_reset_password := ResetPasswordModel.objects(
-                token_web=token
-            ).first():
-                if (
-                    data_reset_password.expired_at.replace(tzinfo=timezone.utc)
-                    > created_at
-                ):
-                    return data_reset_password
-                else:
-                    data_reset_password.user.save()
-                    data_reset_password.delete()
-        if category == "by_token_email":
-            if data_reset_password := ResetPasswordModel.objects(
-                token_email=token
-            ).first():
-                if (
-                    data_reset_password.expired_at.replace(tzinfo=timezone.utc)
-                    > created_at
-                ):
-                    return data_reset_password
-                else:
-                    data_reset_password.user.save()
-                    data_reset_password.delete()
+        if category in ("by_token_web", "by_token_email"):
+            return ResetPasswordModel.active(created_at, token=token)
 
     @staticmethod
     async def delete(category, **kwargs):
@@ -59,15 +34,16 @@ class ResetPasswordDatabase(Database):
         new_password = kwargs.get("new_password")
         created_at = kwargs.get("created_at")
         if category == "user_password_by_token_email":
-            if user_data := UserModel.objects(id=user_id).first():
-                if data_account_active := ResetPasswordModel.objects(
-                    user=user_data
-                ).first():
-                    user_data.password = new_password
-                    user_data.updated_at = created_at
-                    user_data.save()
-                    data_account_active.delete()
-                    return data_account_active
+            if data_reset_password := ResetPasswordModel.objects(
+                user=ObjectId(user_id)
+            ).first():
+                if user_data := modify_user(
+                    user_id, set__password=new_password, inc__token_version=1
+                ):
+                    RefreshTokenModel.objects(user=user_data.id).delete()
+                    data_reset_password.delete()
+                    data_reset_password._data["user"] = user_data
+                    return data_reset_password
 
     @staticmethod
     async def update(category, **kwargs):
@@ -1,5 +1,6 @@
 from .database import Database
 from ..models import UserModel, ChatRoomModel, ChatHistoryModel
+import datetime
 
 
 class RoomChatDatabase(Database):
@@ -14,7 +15,6 @@ class RoomChatDatabase(Database):
                 user_chat = ChatHistoryModel(
                     original_message=original_message,
                     response_message=response_message,
-                    user=user_data,
                     room=user_room,
                 )
                 user_chat.save()
@@ -26,7 +26,6 @@ class RoomChatDatabase(Database):
                 user_chat = ChatHistoryModel(
                     original_message=original_message,
                     response_message=response_message,
-                    user=user_data,
                     room=user_room,
                 )
                 user_chat.save()
@@ -36,31 +35,28 @@ class RoomChatDatabase(Database):
     async def get(category, **kwargs):
         user_id = kwargs.get("user_id")
         if category == "get_all_rooms_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                if user_rooms := ChatRoomModel.objects(user=user_data).order_by(
-                    "-created_at"
-                ):
-                    return user_rooms
+            # A list, not the queryset: testing a queryset for truth runs a
+            # query of its own before it is iterated.
+            if user_rooms := list(ChatRoomModel.objects(user=user_id).order_by("-id")):
+                return user_rooms
 
     @staticmethod
     def get_sync(category, **kwargs):
         user_id = kwargs.get("user_id")
         room_id = kwargs.get("room_id")
+        if category == "get_active_rooms_by_user_id":
+            return ChatRoomModel.objects(user=user_id, deleted_at=None).order_by("-id")
         if category == "get_room_by_room_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                if room_data := ChatRoomModel.objects(
-                    id=room_id, user=user_data
-                ).first():
-                    return room_data
+            if room_data := ChatRoomModel.objects(id=room_id, user=user_id).first():
+                return room_data
 
     @staticmethod
     async def delete(category, **kwargs):
         user_id = kwargs.get("user_id")
         if category == "delete_all_rooms_by_user_id":
-            if user_data := UserModel.objects(id=user_id).first():
-                if user_rooms := ChatRoomModel.objects(user=user_data):
-                    user_rooms.delete()
-                    return user_rooms
+            if user_rooms := ChatRoomModel.objects(user=user_id):
+                user_rooms.delete()
+                return user_rooms
 
     @staticmethod
     async def update(category, **kwargs):
@@ -68,4 +64,12 @@ class RoomChatDatabase(Database):
 
     @staticmethod
     def update_sync(category, **kwargs):
-        pass
+        user_id = kwargs.get("user_id")
+        room = kwargs.get("room")
+        if category == "upsert_by_room":
+            now = datetime.datetime.now(datetime.timezone.utc)
+            return ChatRoomModel.objects(room=room, user=user_id).modify(
+                upsert=True,
+                new=True,
+                set__updated_at=now,
+            )
@@ -1,5 +1,18 @@
 from .database import Database
-from ..models import UserModel, OtpEmailModel
+from ..models import UserModel, OtpEmailModel, RefreshTokenModel
+from mongoengine import signals
+import datetime
+
+
+def modify_user(user_id, **kwargs):
+    """Update a user in one round trip, firing post_save like UserModel.save."""
+    if user_data := UserModel.objects(id=user_id).modify(
+        new=True,
+        set__updated_at=datetime.datetime.now(datetime.timezone.utc),
+        **kwargs,
+    ):
+        signals.post_save.send(UserModel, document=user_data, created=False)
+    return user_data
 
 
 class UserDatabase(Database):
@@ -36,12 +49,15 @@ class UserDatabase(Database):
         created_at = kwargs.get("created_at")
         deleted_id = kwargs.get("deleted_id")
         avatar = kwargs.get("avatar")
+        if category == "rehash_password":
+            return UserModel.objects(id=user_id).update_one(set__password=password)
+        if category == "password":
+            if user_data := modify_user(
+                user_id, set__password=password, inc__token_version=1
+            ):
+                RefreshTokenModel.objects(user=user_data.id).delete()
+            return user_data
         if user_data := UserModel.objects(id=user_id).first():
-            if category == "password":
-                user_data.password = password
-                user_data.updated_at = created_at
-                user_data.save()
-                return user_data
             if category == "profile":
                 if email:
                     user_data.email = email
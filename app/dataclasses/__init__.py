@@ -1 +1,2 @@
 from .access_token import *
+from .socket_session import *
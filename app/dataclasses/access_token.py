@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 @dataclass
 class AccessTokenSchema:
     access_token: str
     created_at: datetime
+    refresh_token: Optional[str] = None
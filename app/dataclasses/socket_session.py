@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class SocketSessionSchema:
+    user_id: str
+    is_active: bool
+    iat: int
@@ -7,6 +7,8 @@ from .config import (
     cloudinary_api_secret,
     cloudinary_api_key,
     cloudinary_cloud_name,
+    socketio_serializer,
+    socketio_compression_threshold,
 )
 from .utils import limiter_key
 import cloudinary
@@ -27,6 +29,8 @@ socket_io = SocketIO(
     async_mode="eventlet",
     message_queue=f"{celery_url}",
     max_http_buffer_size=100 * 1024 * 1024,
+    serializer=socketio_serializer,
+    compression_threshold=socketio_compression_threshold,
 )
 
 
@@ -1,5 +1,6 @@
 import datetime
 from flask import request, make_response
+from .utils import query_counter
 
 
 def register_middlewares(app):
@@ -10,19 +11,27 @@ def register_middlewares(app):
             "GET, POST, PUT, PATCH, DELETE, OPTIONS"
         )
         response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, If-None-Match"
+            "Content-Type, Authorization, If-None-Match, Idempotency-Key"
         )
         response.headers["Access-Control-Expose-Headers"] = "ETag"
+        if app.config["QUERY_COUNT_HEADER"]:
+            response.headers["X-Query-Count"] = str(query_counter.total())
+            response.headers["Access-Control-Expose-Headers"] = "ETag, X-Query-Count"
         return response
 
+    @app.teardown_request
+    def stop_query_counter(exc):
+        query_counter.stop()
+
     @app.before_request
     def before_request():
         request.timestamp = datetime.datetime.now(datetime.timezone.utc)
+        query_counter.start()
         if request.method == "OPTIONS":
             response = make_response()
             response.headers["Access-Control-Allow-Origin"] = "*"
             response.headers["Access-Control-Allow-Headers"] = (
-                "Content-Type,Authorization,If-None-Match"
+                "Content-Type,Authorization,If-None-Match,Idempotency-Key"
             )
             response.headers["Access-Control-Allow-Methods"] = (
                 "GET,PUT,POST,DELETE,OPTIONS"
@@ -5,3 +5,5 @@ from .blacklist_token import *
 from .otp_email import *
 from .chat_history import *
 from .room_chat import *
+from .refresh_token import *
+from .chat_history_bucket import *
@@ -1,12 +1,9 @@
 import mongoengine as me
-from .base import BaseDocument
+from .ephemeral_token import EphemeralTokenDocument
 
 
-class AccountActiveModel(BaseDocument):
+class AccountActiveModel(EphemeralTokenDocument):
     token = me.StringField(required=True)
     otp = me.StringField(required=True)
-    expired_at = me.DateTimeField(required=True)
 
-    user = me.ReferenceField("UserModel", reverse_delete_rule=me.CASCADE)
-
-    meta = {"collection": "account_active"}
+    meta = {"collection": "account_active", "indexes": ["token"]}
@@ -5,8 +5,12 @@ import datetime
 class BaseDocument(me.Document):
     meta = {"abstract": True}
 
-    created_at = me.DateTimeField(default=datetime.datetime.now(datetime.timezone.utc))
-    updated_at = me.DateTimeField(default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = me.DateTimeField(
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    updated_at = me.DateTimeField(
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
     deleted_at = me.DateTimeField(null=True)
 
     def save(self, *args, **kwargs):
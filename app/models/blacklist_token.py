@@ -4,7 +4,12 @@ from .base import BaseDocument
 
 class BlacklistTokenModel(BaseDocument):
     created_at = me.IntField(required=True)
+    jti = me.StringField(required=False)
+    expired_at = me.DateTimeField(required=False)
 
     user = me.ReferenceField("UserModel", reverse_delete_rule=me.CASCADE)
 
-    meta = {"collection": "blacklist_token"}
+    meta = {
+        "collection": "blacklist_token",
+        "indexes": ["jti", {"fields": ["expired_at"], "expireAfterSeconds": 0}],
+    }
@@ -1,16 +1,32 @@
 import mongoengine as me
-from .user import UserModel
 from .room_chat import ChatRoomModel
-from .base import BaseDocument
+from .fields import CompressedStringField, SparseListField, SparseBooleanField
 
 
-class ChatHistoryModel(BaseDocument):
-    text = me.StringField(required=True)
-    links = me.ListField(me.StringField())
-    role = me.StringField(required=True)
-    is_image = me.BooleanField(required=False, default=False)
+class ChatHistoryModel(me.Document):
+    # Stored compactly: short keys, no user (the room implies it), no
+    # timestamps (messages are immutable, so the _id time is created_at) and
+    # empty or default values left out.
+    text = CompressedStringField(db_field="x", required=True)
+    links = SparseListField(me.StringField(), db_field="l")
+    role = me.StringField(db_field="r", required=True)
+    is_image = SparseBooleanField(db_field="i")
 
-    user = me.ReferenceField(UserModel, reverse_delete_rule=me.CASCADE)
-    room = me.ReferenceField(ChatRoomModel, reverse_delete_rule=me.CASCADE)
+    room = me.ReferenceField(
+        ChatRoomModel, db_field="o", reverse_delete_rule=me.CASCADE
+    )
 
-    meta = {"collection": "chat_history"}
+    deleted_at = None
+
+    meta = {
+        "collection": "chat_history",
+        "indexes": [("room", "id")],
+    }
+
+    @property
+    def created_at(self):
+        return self.id.generation_time if self.id else None
+
+    @property
+    def updated_at(self):
+        return self.created_at
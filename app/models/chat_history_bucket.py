@@ -0,0 +1,28 @@
+import mongoengine as me
+from .room_chat import ChatRoomModel
+from .fields import CompressedStringField, SparseListField, SparseBooleanField
+
+
+class ChatMessage(me.EmbeddedDocument):
+    id = me.ObjectIdField(db_field="_id", required=True)
+    text = CompressedStringField(db_field="x", required=True)
+    links = SparseListField(me.StringField(), db_field="l")
+    role = me.StringField(db_field="r", required=True)
+    is_image = SparseBooleanField(db_field="i")
+
+
+class ChatHistoryBucketModel(me.Document):
+    count = me.IntField(db_field="n", required=True, default=0)
+    # Set on buckets written by the migration, so live appends never land in
+    # an old partial bucket.
+    closed = SparseBooleanField(db_field="c")
+    messages = me.EmbeddedDocumentListField(ChatMessage, db_field="m")
+
+    room = me.ReferenceField(
+        ChatRoomModel, db_field="o", reverse_delete_rule=me.CASCADE
+    )
+
+    meta = {
+        "collection": "chat_history_bucket",
+        "indexes": [("room", "id")],
+    }
@@ -0,0 +1,20 @@
+import mongoengine as me
+from .base import BaseDocument
+
+
+class EphemeralTokenDocument(BaseDocument):
+    expired_at = me.DateTimeField(required=True)
+
+    user = me.ReferenceField("UserModel", reverse_delete_rule=me.CASCADE)
+
+    meta = {
+        "abstract": True,
+        "indexes": [
+            "user",
+            {"fields": ["expired_at"], "expireAfterSeconds": 0},
+        ],
+    }
+
+    @classmethod
+    def active(cls, created_at, **kwargs):
+        return cls.objects(expired_at__gt=created_at, **kwargs).first()
@@ -0,0 +1,69 @@
+import zlib
+import mongoengine as me
+from bson import Binary
+from ..config import chat_text_codec, chat_text_compress_min
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB = b"z"
+ZSTD = b"s"
+
+
+def compress_text(text, codec=chat_text_codec):
+    data = text.encode("utf-8")
+    if codec == "zstd" and zstandard is not None:
+        return Binary(ZSTD + zstandard.ZstdCompressor().compress(data))
+    return Binary(ZLIB + zlib.compress(data, 6))
+
+
+def decompress_text(value):
+    value = bytes(value)
+    if value[:1] == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd compressed text")
+        return zstandard.ZstdDecompressor().decompress(value[1:]).decode("utf-8")
+    return zlib.decompress(value[1:]).decode("utf-8")
+
+
+class CompressedStringField(me.StringField):
+    """Stores strings of at least ``min_bytes`` UTF-8 bytes compressed."""
+
+    def __init__(
+        self, min_bytes=chat_text_compress_min, codec=chat_text_codec, **kwargs
+    ):
+        self.min_bytes = min_bytes
+        self.codec = codec
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        if isinstance(value, bytes):
+            return decompress_text(value)
+        return super().to_python(value)
+
+    def to_mongo(self, value):
+        size = len(value.encode("utf-8"))
+        if self.codec != "none" and size >= self.min_bytes:
+            compressed = compress_text(value, self.codec)
+            if len(compressed) < size:
+                return compressed
+        return value
+
+
+class SparseListField(me.ListField):
+    """A ListField that leaves the key out instead of storing []."""
+
+    def to_mongo(self, value, use_db_field=True, fields=None):
+        return super().to_mongo(value, use_db_field, fields) or None
+
+
+class SparseBooleanField(me.BooleanField):
+    """A BooleanField that stores only True and reads a missing key as False."""
+
+    def __init__(self, **kwargs):
+        super().__init__(default=False, **kwargs)
+
+    def to_mongo(self, value):
+        return True if value else None
@@ -1,12 +1,8 @@
 import mongoengine as me
-from .base import BaseDocument
-from .user import UserModel
+from .ephemeral_token import EphemeralTokenDocument
 
 
-class OtpEmailModel(BaseDocument):
+class OtpEmailModel(EphemeralTokenDocument):
     otp = me.StringField(required=True)
-    expired_at = me.IntField(required=True)
-
-    user = me.ReferenceField(UserModel, reverse_delete_rule=me.CASCADE)
 
     meta = {"collection": "otp_email"}
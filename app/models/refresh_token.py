@@ -0,0 +1,19 @@
+import mongoengine as me
+from .base import BaseDocument
+
+
+class RefreshTokenModel(BaseDocument):
+    jti = me.StringField(required=True, unique=True)
+    family = me.StringField(required=True)
+    used_at = me.DateTimeField(required=False)
+    expired_at = me.DateTimeField(required=True)
+
+    user = me.ReferenceField("UserModel", reverse_delete_rule=me.CASCADE)
+
+    meta = {
+        "collection": "refresh_token",
+        "indexes": [
+            "family",
+            {"fields": ["expired_at"], "expireAfterSeconds": 0},
+        ],
+    }
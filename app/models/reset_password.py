@@ -1,11 +1,8 @@
 import mongoengine as me
-from .base import BaseDocument
+from .ephemeral_token import EphemeralTokenDocument
 
 
-class ResetPasswordModel(BaseDocument):
+class ResetPasswordModel(EphemeralTokenDocument):
     token = me.StringField(required=True)
-    expired_at = me.DateTimeField(required=True)
 
-    user = me.ReferenceField("UserModel", reverse_delete_rule=me.CASCADE)
-
-    meta = {"collection": "reset_password"}
+    meta = {"collection": "reset_password", "indexes": ["token"]}
@@ -1,12 +1,27 @@
 import mongoengine as me
+import datetime
 from .user import UserModel
-from .base import BaseDocument
 
 
-class ChatRoomModel(BaseDocument):
-    title = me.StringField(required=False)
-    room = me.StringField(required=True, unique=True)
+class ChatRoomModel(me.Document):
+    title = me.StringField(db_field="t", required=False)
+    room = me.StringField(db_field="r", required=True, unique=True, sparse=True)
+    updated_at = me.DateTimeField(
+        db_field="m", default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    deleted_at = me.DateTimeField(db_field="d")
 
-    user = me.ReferenceField(UserModel, reverse_delete_rule=me.CASCADE)
+    user = me.ReferenceField(UserModel, db_field="u", reverse_delete_rule=me.CASCADE)
 
-    meta = {"collection": "chat_room"}
+    meta = {
+        "collection": "chat_room",
+        "indexes": [("user", "deleted_at", "-id"), ("user", "-id")],
+    }
+
+    @property
+    def created_at(self):
+        return self.id.generation_time if self.id else None
+
+    def save(self, *args, **kwargs):
+        self.updated_at = datetime.datetime.now(datetime.timezone.utc)
+        return super().save(*args, **kwargs)
@@ -10,6 +10,7 @@ class UserModel(BaseDocument):
     avatar = me.StringField(required=True)
     role = me.StringField(required=False, default="user")
     is_active = me.BooleanField(required=False, default=True)
+    token_version = me.IntField(required=False, default=0)
     updated_email_at = me.DateTimeField(required=False)
 
     meta = {"collection": "users"}
@@ -58,6 +58,14 @@ async def user_logout():
     return await login_controller.user_logout(user, token)
 
 
+@auth_router.post("/refresh")
+async def refresh_token():
+    data = request.json
+    timestamp = request.timestamp
+    refresh_token = data.get("refresh_token", "")
+    return await login_controller.refresh_token(refresh_token, timestamp)
+
+
 @auth_router.post("/reset-password/request")
 async def send_reset_password_email():
     data = request.json
@@ -15,7 +15,10 @@ async def user_login():
     text = form.get("text", "")
     room = form.get("room", "")
     docs = files.get("file", None)
-    return await chat_bot_controller.create_message(user, text, room, docs)
+    idempotency_key = request.headers.get("Idempotency-Key")
+    return await chat_bot_controller.create_message(
+        user, text, room, docs, idempotency_key
+    )
 
 
 @chat_bot_router.get("/messages")
@@ -10,6 +10,7 @@ class TokenSerializer(SerializerInterface):
         token_data: Union[AccountActiveModel, ResetPasswordModel, AccessTokenSchema],
         id_is_null: bool = False,
         access_token_is_null: bool = False,
+        refresh_token_is_null: bool = False,
         token_is_null: bool = False,
         otp_is_null: bool = False,
         created_at_is_null: bool = False,
@@ -35,4 +36,6 @@ class TokenSerializer(SerializerInterface):
         if isinstance(token_data, AccessTokenSchema):
             if not access_token_is_null:
                 data["access_token"] = token_data.access_token
+            if not refresh_token_is_null and token_data.refresh_token:
+                data["refresh_token"] = token_data.refresh_token
         return data
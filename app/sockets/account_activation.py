@@ -1,48 +1,21 @@
 from flask import request
-from flask_socketio import SocketIO, disconnect, join_room
+from flask_socketio import SocketIO, disconnect, join_room, emit
 from ..models import AccountActiveModel
+from .. import countdown_scheduler
 import time
 import datetime
 from datetime import timezone
 
 
 def register_account_activation_socketio_events(socket_io: SocketIO):
-    countdowns = {}
+    def delete_expired_tokens(tokens):
+        AccountActiveModel.objects(token__in=tokens).delete()
 
-    def countdown_thread(room, token):
-        while True:
-            now = time.time()
-            expired_time = countdowns.get(room)
-            if not expired_time:
-                break
-            remaining = int(expired_time - now)
-            if remaining <= 0:
-                socket_io.emit(
-                    "countdown",
-                    {"remaining": 0},
-                    room=room,
-                    namespace="/account-activation",
-                )
-                if data_token := AccountActiveModel.objects(token=token).first():
-                    data_token.delete()
-                socket_io.emit(
-                    "expired",
-                    {"status": "expire", "message": "your session expired"},
-                    room=room,
-                    namespace="/account-activation",
-                )
-                del countdowns[room]
-                if hasattr(countdown_thread, "running_rooms"):
-                    countdown_thread.running_rooms.discard(room)
-                break
-            else:
-                socket_io.emit(
-                    "countdown",
-                    {"remaining": remaining},
-                    room=room,
-                    namespace="/account-activation",
-                )
-            socket_io.sleep(1)
+    countdown_scheduler.register_namespace(
+        "/account-activation",
+        delete_expired_tokens,
+        {"status": "expire", "message": "your session expired"},
+    )
 
     @socket_io.on("connect", namespace="/account-activation")
     def handle_connect():
@@ -78,14 +51,7 @@ def register_account_activation_socketio_events(socket_io: SocketIO):
         else:
             expired_time = now + 5 * 60
 
-        countdowns[room] = expired_time
-
         remaining = max(0, int(expired_time - now))
-        socket_io.emit("countdown", {"remaining": remaining})
-
-        if not hasattr(countdown_thread, "running_rooms"):
-            countdown_thread.running_rooms = set()
+        emit("countdown", {"remaining": remaining})
 
-        if room not in countdown_thread.running_rooms:
-            countdown_thread.running_rooms.add(room)
-            socket_io.start_background_task(countdown_thread, room, token)
+        countdown_scheduler.schedule("/account-activation", room, token, expired_time)
@@ -2,10 +2,23 @@ from flask_socketio import emit, join_room, disconnect
 from flask import request
 import uuid
 import datetime
-from ..utils import GeminiAI, AuthJwt, ImageKitImageGenerator
-from ..models import UserModel, BlacklistTokenModel, ChatHistoryModel, ChatRoomModel
+import traceback
+from bson import ObjectId
+from ..utils import (
+    GeminiAI,
+    token_auth_cache,
+    ImageKitImageGenerator,
+    BackgroundWorkerPool,
+    GenerationTracker,
+    user_channel,
+    chat_batch,
+)
+from ..models import ChatHistoryModel, ChatRoomModel
 from ..serializers import RoomChatSerializer
-from .. import _HISTORY, _ROOM_HAS_SYSTEM, _SID_ROOM, _SID_USER
+from ..databases import RoomChatDatabase, chat_history_store
+from ..dataclasses import SocketSessionSchema
+from ..config import chat_max_concurrency
+from .. import _HISTORY, socket_state, chat_history_buffer, idempotency_store
 
 
 def register_chat_bot_socketio_events(socketio):
@@ -15,6 +28,8 @@ def register_chat_bot_socketio_events(socketio):
     api_gemini = GeminiAI()
     image_generator = ImageKitImageGenerator()
     room_chat_serializer = RoomChatSerializer()
+    chat_pool = BackgroundWorkerPool(socketio, chat_max_concurrency)
+    generation_tracker = GenerationTracker()
 
     @socketio.on("connect", namespace=NAMESPACE)
     def handle_connect(auth=None):
@@ -28,48 +43,27 @@ def register_chat_bot_socketio_events(socketio):
             disconnect(sid=sid)
             return
 
-        payload = AuthJwt.verify_token_sync(token)
-        if payload is None:
-            disconnect(sid=sid)
-            return
-
-        user_id = payload.get("sub")
-        if not user_id:
-            disconnect(sid=sid)
-            return
-
-        user = UserModel.objects(id=user_id).first()
-        if not user:
-            disconnect(sid=sid)
-            return
-
-        iat = payload.get("iat")
-        issued_time = datetime.datetime.fromtimestamp(iat, tz=datetime.timezone.utc)
-        ua = getattr(user, "updated_at", None)
-        if ua is not None and ua.tzinfo is None:
-            ua = ua.replace(tzinfo=datetime.timezone.utc)
-
-        SKEW = datetime.timedelta(seconds=60)
-        if ua and (issued_time + SKEW) < ua:
-            disconnect(sid=sid)
-            return
-
-        jti = payload.get("jti")
-        if jti and BlacklistTokenModel.objects(jti=jti).first():
+        if not (result := token_auth_cache.authenticate(token)):
             disconnect(sid=sid)
             return
+        payload, user = result
 
         if not user.is_active:
             disconnect(sid=sid)
             return
 
-        _SID_USER[sid] = user
-
         if not room:
             room = f"room-{uuid.uuid4().hex}"
 
         join_room(room, sid=sid, namespace=NAMESPACE)
-        _SID_ROOM[sid] = room
+        join_room(user_channel(user.id), sid=sid, namespace=NAMESPACE)
+        socket_state.add_session(
+            sid,
+            SocketSessionSchema(
+                user_id=f"{user.id}", is_active=user.is_active, iat=payload.get("iat")
+            ),
+            room,
+        )
 
         print(
             f"[connect] ns={NAMESPACE} sid={sid} room={room} ip={request.remote_addr}"
@@ -84,19 +78,19 @@ def register_chat_bot_socketio_events(socketio):
         emit(
             "room_created",
             {"room": room, "ts": now_ts},
-
             to=room,
             namespace=NAMESPACE,
         )
 
-        user_room = ChatRoomModel.objects(room=room, user=user).first()
+        user_room = ChatRoomModel.objects(room=room, user=user).only("id").first()
 
         history_items = []
         if user_room is not None:
-            user_chat_histories = (
-                ChatHistoryModel.objects(room=user_room, user=user)
-                .order_by("id")
-                .limit(200)
+            chat_history_buffer.flush()
+            user_chat_histories = chat_history_store.messages(
+                user_room,
+                limit=200,
+                fields=("id", "role", "text", "is_image"),
             )
 
             for ch in user_chat_histories:
@@ -126,7 +120,6 @@ def register_chat_bot_socketio_events(socketio):
                 "chat",
                 {"type": "history", "items": history_items, "ts": now_ts},
                 to=room,
-
                 namespace=NAMESPACE,
             )
         else:
@@ -142,51 +135,193 @@ def register_chat_bot_socketio_events(socketio):
                     "text": "Belum ada pesan. Mulai ngobrol di bawah ✨",
                     "ts": now_ts2,
                 },
-
                 to=room,
                 namespace=NAMESPACE,
             )
-            _ROOM_HAS_SYSTEM.add(room)
-
+            socket_state.mark_system_message(room)
 
     @socketio.on("disconnect", namespace=NAMESPACE)
     def handle_disconnect():
         sid = request.sid
-        _SID_ROOM.pop(sid, None)
-        _SID_USER.pop(sid, None)
+        generation_tracker.cancel(sid)
+        socket_state.remove_session(sid)
         print(f"[disconnect] ns={NAMESPACE} sid={sid} ip={request.remote_addr}")
 
+    def emit_progress(room, message_id, status):
+        socketio.emit(
+            "chat_progress",
+            {"id": message_id, "room": room, "status": status},
+            to=room,
+            namespace=NAMESPACE,
+        )
+
+    def process_chat(sid, room, text, message_id, session, task, idempotency_key):
+        user_room = None
+        completed = False
+        task.killable = False
+        try:
+            user_id = ObjectId(session.user_id) if session is not None else None
+            if user_id is not None:
+                user_room = RoomChatDatabase.update_sync(
+                    "upsert_by_room", room=room, user_id=user_id
+                )
+
+                chat_history_buffer.add(
+                    ChatHistoryModel(
+                        text=text,
+                        role="user",
+                        room=user_room,
+                        is_image=False,
+                        links=[],
+                    )
+                )
+
+            if task.cancelled.is_set():
+                emit_progress(room, message_id, "cancelled")
+                return
+
+            emit_progress(room, message_id, "thinking")
+
+            task.killable = True
+            bot_result = api_gemini.handle_request(
+                text,
+                image_generator,
+                on_progress=lambda status: emit_progress(room, message_id, status),
+            )
+            task.killable = False
+            bot_text = bot_result.get("content", "")
+            is_image = bot_result.get("is_image", False)
+
+            if user_room is not None:
+                chat_history_buffer.add(
+                    ChatHistoryModel(
+                        text=bot_text,
+                        role="assistant",
+                        room=user_room,
+                        is_image=is_image,
+                        links=[],
+                    )
+                )
+
+            if task.cancelled.is_set():
+                emit_progress(room, message_id, "cancelled")
+                return
+
+            now_ts_assistant = (
+                datetime.datetime.now(datetime.timezone.utc)
+                .isoformat()
+                .replace("+00:00", "Z")
+            )
+            assistant_message = {
+                "id": message_id,
+                "type": "assistant",
+                "text": bot_text,
+                "ts": now_ts_assistant,
+                "room": room,
+                "is_image": is_image,
+            }
+            socketio.emit("chat", assistant_message, to=room, namespace=NAMESPACE)
+
+            if idempotency_key:
+                idempotency_store.complete(
+                    idempotency_key,
+                    {
+                        "status": "done",
+                        "id": message_id,
+                        "room": room,
+                        "message": assistant_message,
+                    },
+                )
+            completed = True
+
+            _HISTORY.append(
+                {
+                    "room": room,
+                    "role": "assistant",
+                    "text": bot_text,
+                    "ts": now_ts_assistant,
+                    "is_image": is_image,
+                }
+            )
+            if len(_HISTORY) > HISTORY_CAP:
+                del _HISTORY[: len(_HISTORY) - HISTORY_CAP]
+
+            if user_room is not None:
+                histories = chat_history_buffer.first_for_room(user_room)
+
+                context_list = []
+                for h in histories:
+                    context_list.append(f"{h.role}: {h.text}")
+
+                if context_list:
+                    title_room = api_gemini.generate_title_from_context(context_list)
+                    user_room.title = title_room
+                    user_room.save()
+
+                socketio.emit(
+                    "room_upserted",
+                    {"room": room_chat_serializer.serialize(user_room)},
+                    to=user_channel(user_id),
+                    namespace=NAMESPACE,
+                )
+
+            emit_progress(room, message_id, "done")
+        except Exception:
+            traceback.print_exc()
+            emit_progress(room, message_id, "failed")
+        except BaseException:
+            emit_progress(room, message_id, "cancelled")
+            raise
+        finally:
+            if idempotency_key and not completed:
+                idempotency_store.discard(idempotency_key)
+            generation_tracker.finish(sid, message_id)
+
     @socketio.on("chat", namespace=NAMESPACE)
     def handle_chat(data):
         sid = request.sid
 
         payload_room = (data or {}).get("room")
-        room = (payload_room or _SID_ROOM.get(sid) or "").strip()
+        room = (payload_room or socket_state.get_room(sid) or "").strip()
         if not room:
             room = f"room-{uuid.uuid4().hex}"
-            _SID_ROOM[sid] = room
-
+            socket_state.set_room(sid, room)
 
         text = (data or {}).get("text", "").strip()
         file = (data or {}).get("file")
         if not text:
             return
 
+        message_id = (data or {}).get("id") or uuid.uuid4().hex
+        session = socket_state.get_session(sid)
+
+        idempotency_key = (data or {}).get("idempotency_key")
+        if idempotency_key:
+            owner = session.user_id if session is not None else sid
+            idempotency_key = f"chat:{owner}:{idempotency_key}"
+            if record := idempotency_store.begin(
+                idempotency_key,
+                {"status": "in_progress", "id": message_id, "room": room},
+            ):
+                if record.get("message"):
+                    emit("chat", record["message"], to=sid, namespace=NAMESPACE)
+                return {
+                    "status": record["status"],
+                    "id": record["id"],
+                    "room": record["room"],
+                    "duplicate": True,
+                }
+
         join_room(room, sid=sid, namespace=NAMESPACE)
 
-        if room in _ROOM_HAS_SYSTEM:
+        chat_items = []
+        if socket_state.clear_system_message(room):
             now_ts_clear = (
                 datetime.datetime.now(datetime.timezone.utc)
                 .isoformat()
                 .replace("+00:00", "Z")
             )
-            emit(
-                "chat",
-                {"type": "system_clear", "ts": now_ts_clear},
-                to=room,
-                namespace=NAMESPACE,
-            )
-            _ROOM_HAS_SYSTEM.discard(room)
+            chat_items.append({"type": "system_clear", "ts": now_ts_clear})
 
         now_ts_user = (
             datetime.datetime.now(datetime.timezone.utc)
@@ -195,100 +330,58 @@ def register_chat_bot_socketio_events(socketio):
         )
 
         user_message = {
+            "id": message_id,
             "type": "user",
             "text": text,
             "ts": now_ts_user,
             "room": room,
         }
-        emit("chat", user_message, to=room, namespace=NAMESPACE)
+        chat_items.append(user_message)
+        emit("chat", chat_batch(chat_items), to=room, namespace=NAMESPACE)
 
         _HISTORY.append({"room": room, "role": "user", "text": text, "ts": now_ts_user})
         if len(_HISTORY) > HISTORY_CAP:
             del _HISTORY[: len(_HISTORY) - HISTORY_CAP]
 
-        bot_result = api_gemini.handle_request(text, image_generator)
-        bot_text = bot_result.get("content", "")
-        is_image = bot_result.get("is_image", False)
-
-        now_ts_assistant = (
-            datetime.datetime.now(datetime.timezone.utc)
-            .isoformat()
-            .replace("+00:00", "Z")
-        )
-        assistant_message = {
-            "type": "assistant",
-            "text": bot_text,
-            "ts": now_ts_assistant,
-            "room": room,
-            "is_image": is_image,
-        }
-        emit("chat", assistant_message, to=room, namespace=NAMESPACE)
-
-        _HISTORY.append(
-            {
-                "room": room,
-                "role": "assistant",
-                "text": bot_text,
-                "ts": now_ts_assistant,
-                "is_image": is_image,
-            }
+        task = generation_tracker.register(sid, room, message_id)
+        task.thread = chat_pool.submit(
+            process_chat,
+            sid,
+            room,
+            text,
+            message_id,
+            session,
+            task,
+            idempotency_key,
+            serial_key=room,
         )
-        if len(_HISTORY) > HISTORY_CAP:
-            del _HISTORY[: len(_HISTORY) - HISTORY_CAP]
-
-        user = _SID_USER.get(sid)
-        if user is not None:
-            user_room = ChatRoomModel.objects(room=room, user=user).first()
-
-            if not user_room:
-                user_room = ChatRoomModel(room=room, user=user)
-                user_room.save()
-
-            ChatHistoryModel(
-                text=text,
-                role="user",
-                user=user,
-                room=user_room,
-                is_image=False,
-                links=[],
-            ).save()
-
-            ChatHistoryModel(
-                text=bot_text,
-                role="assistant",
-                user=user,
-                room=user_room,
-                is_image=is_image,
-                links=[],
-            ).save()
-
-            histories = (
-                ChatHistoryModel.objects(room=user_room, user=user)
-                .order_by("id")
-                .limit(10)
-            )
 
-            context_list = []
-            for h in histories:
-                context_list.append(f"{h.role}: {h.text}")
+        return {"status": "accepted", "id": message_id, "room": room}
 
-            if context_list:
-                title_room = api_gemini.generate_title_from_context(context_list)
-                user_room.title = title_room
-                user_room.save()
+    @socketio.on("stop", namespace=NAMESPACE)
+    def handle_stop(data=None):
+        sid = request.sid
+        room = (data or {}).get("room")
+        cancelled = generation_tracker.cancel(sid, room)
+        return {"status": "stopped", "ids": cancelled}
 
-            latest_rooms = ChatRoomModel.objects(user=user, deleted_at=None)
+    @socketio.on("rooms_resync", namespace=NAMESPACE)
+    def handle_rooms_resync():
+        sid = request.sid
 
-            room_items = []
-            for r in latest_rooms:
-                room_items.append(room_chat_serializer.serialize(r))
+        session = socket_state.get_session(sid)
+        if session is None:
+            return
 
-            room_items.reverse()
+        latest_rooms = RoomChatDatabase.get_sync(
+            "get_active_rooms_by_user_id", user_id=session.user_id
+        )
 
-            emit(
-                "rooms_updated",
-                {"rooms": room_items},
-                to=room,
-                namespace=NAMESPACE,
-            )
+        room_items = [room_chat_serializer.serialize(r) for r in latest_rooms or []]
 
+        emit(
+            "rooms_updated",
+            {"rooms": room_items},
+            to=sid,
+            namespace=NAMESPACE,
+        )
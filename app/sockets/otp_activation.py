@@ -1,6 +1,7 @@
 from flask import request
 from flask_socketio import SocketIO
-from ..utils import Validation
+from ..utils import Validation, DebouncedValidator
+from ..config import validation_debounce_ms
 from ..databases import AccountActiveDatabase
 import datetime
 
@@ -8,7 +9,7 @@ import datetime
 def register_otp_activation_socketio_events(socket_io: SocketIO):
     validation = Validation()
 
-    def _do_validation(sid, data):
+    def _do_validation(data):
         timestamp = datetime.datetime.now(datetime.timezone.utc)
         errors = {}
         if "token" in data:
@@ -20,17 +21,11 @@ def register_otp_activation_socketio_events(socket_io: SocketIO):
         else:
             errors.setdefault("otp", []).append("IS_REQUIRED")
         if errors:
-            socket_io.emit(
-                "validation",
-                {
-                    "errors": errors,
-                    "success": len(errors) == 0,
-                    "message": "validation errors",
-                },
-                namespace="/otp-activation",
-                to=sid,
-            )
-            return
+            return {
+                "errors": errors,
+                "success": len(errors) == 0,
+                "message": "validation errors",
+            }
         if not (
             user_token := AccountActiveDatabase.get_sync(
                 "by_token", token=data["token"], created_at=timestamp
@@ -45,31 +40,26 @@ def register_otp_activation_socketio_events(socket_io: SocketIO):
             if "token" not in errors:
                 errors["token"] = ["IS_INVALID"]
         if errors:
-            socket_io.emit(
-                "validation",
-                {
-                    "errors": errors,
-                    "success": len(errors) == 0,
-                    "message": "validation errors",
-                },
-                namespace="/otp-activation",
-            )
-            return
+            return {
+                "errors": errors,
+                "success": len(errors) == 0,
+                "message": "validation errors",
+            }
         AccountActiveDatabase.update_sync(
             "user_active_by_token",
             token=user_token.token,
             user_id=f"{user_token.user.id}",
             otp=user_token.otp,
         )
-        socket_io.emit(
-            "validation",
-            {
-                "errors": errors,
-                "success": len(errors) == 0,
-                "message": "email verified successfully",
-            },
-            namespace="/otp-activation",
-        )
+        return {
+            "errors": errors,
+            "success": len(errors) == 0,
+            "message": "email verified successfully",
+        }
+
+    validator = DebouncedValidator(
+        socket_io, "/otp-activation", _do_validation, validation_debounce_ms / 1000
+    )
 
     @socket_io.on("connect", namespace="/otp-activation")
     def handle_connect():
@@ -77,9 +67,9 @@ def register_otp_activation_socketio_events(socket_io: SocketIO):
 
     @socket_io.on("disconnect", namespace="/otp-activation")
     def handle_disconnect():
+        validator.drop(request.sid)
         print(f"User disconnected from IP: {request.remote_addr}")
 
     @socket_io.on("validation", namespace="/otp-activation")
     def handle_validation(data):
-        sid = request.sid
-        socket_io.start_background_task(_do_validation, sid, data)
+        validator.submit(request.sid, data)
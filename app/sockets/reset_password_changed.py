@@ -1,48 +1,21 @@
 from flask import request
 from flask_socketio import SocketIO, disconnect, join_room, emit
 from ..models import ResetPasswordModel
+from .. import countdown_scheduler
 import time
 import datetime
 from datetime import timezone
 
 
 def register_reset_password_changed_socketio_events(socket_io: SocketIO):
-    countdowns = {}
+    def delete_expired_tokens(tokens):
+        ResetPasswordModel.objects(token__in=tokens).delete()
 
-    def countdown_thread(room, token):
-        while True:
-            now = time.time()
-            expired_time = countdowns.get(room)
-            if not expired_time:
-                break
-            remaining = int(expired_time - now)
-            if remaining <= 0:
-                socket_io.emit(
-                    "countdown",
-                    {"remaining": 0},
-                    room=room,
-                    namespace="/reset-password-changed",
-                )
-                if data_token := ResetPasswordModel.objects(token_email=token).first():
-                    data_token.delete()
-                socket_io.emit(
-                    "expired",
-                    {"status": "expire"},
-                    room=room,
-                    namespace="/reset-password-changed",
-                )
-                del countdowns[room]
-                if hasattr(countdown_thread, "running_rooms"):
-                    countdown_thread.running_rooms.discard(room)
-                break
-            else:
-                socket_io.emit(
-                    "countdown",
-                    {"remaining": remaining},
-                    room=room,
-                    namespace="/reset-password-changed",
-                )
-            socket_io.sleep(1)
+    countdown_scheduler.register_namespace(
+        "/reset-password-changed",
+        delete_expired_tokens,
+        {"status": "expire"},
+    )
 
     @socket_io.on("connect", namespace="/reset-password-changed")
     def handle_connect():
@@ -59,7 +32,7 @@ def register_reset_password_changed_socketio_events(socket_io: SocketIO):
             disconnect()
             return
 
-        user_token = ResetPasswordModel.objects(token_email=token).first()
+        user_token = ResetPasswordModel.objects(token=token).first()
         if not user_token:
             disconnect()
             return
@@ -78,14 +51,9 @@ def register_reset_password_changed_socketio_events(socket_io: SocketIO):
         else:
             expired_time = now + 5 * 60
 
-        countdowns[room] = expired_time
-
         remaining = max(0, int(expired_time - now))
         emit("countdown", {"remaining": remaining})
 
-        if not hasattr(countdown_thread, "running_rooms"):
-            countdown_thread.running_rooms = set()
-
-        if room not in countdown_thread.running_rooms:
-            countdown_thread.running_rooms.add(room)
-            socket_io.start_background_task(countdown_thread, room, token)
+        countdown_scheduler.schedule(
+            "/reset-password-changed", room, token, expired_time
+        )
@@ -1,6 +1,7 @@
 from flask import request
 from flask_socketio import SocketIO
-from ..utils import Validation
+from ..utils import Validation, DebouncedValidator
+from ..config import validation_debounce_ms
 
 
 def register_validate_login_socketio_events(socket_io: SocketIO):
@@ -14,11 +15,11 @@ def register_validate_login_socketio_events(socket_io: SocketIO):
         validation.validate_required_text_sync(errors, "email", email)
         validation.validate_required_text_sync(errors, "password", password)
         validation.validate_provider_sync(errors, provider)
-        socket_io.emit(
-            "validation",
-            {"errors": errors, "success": len(errors) == 0},
-            namespace="/validate-login",
-        )
+        return {"errors": errors, "success": len(errors) == 0}
+
+    validator = DebouncedValidator(
+        socket_io, "/validate-login", _do_validation, validation_debounce_ms / 1000
+    )
 
     @socket_io.on("connect", namespace="/validate-login")
     def handle_connect():
@@ -26,8 +27,9 @@ def register_validate_login_socketio_events(socket_io: SocketIO):
 
     @socket_io.on("disconnect", namespace="/validate-login")
     def handle_disconnect():
+        validator.drop(request.sid)
         print(f"User disconnected from IP: {request.remote_addr}")
 
     @socket_io.on("validation", namespace="/validate-login")
     def handle_validation(data):
-        socket_io.start_background_task(_do_validation, data)
+        validator.submit(request.sid, data)
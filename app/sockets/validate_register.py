@@ -1,6 +1,7 @@
 from flask import request
 from flask_socketio import SocketIO
-from ..utils import Validation
+from ..utils import Validation, DebouncedValidator
+from ..config import validation_debounce_ms
 
 
 def register_validate_register_socketio_events(socket_io: SocketIO):
@@ -17,11 +18,11 @@ def register_validate_register_socketio_events(socket_io: SocketIO):
         validation.validate_email_sync(errors, email)
         validation.validate_provider_sync(errors, provider)
         validation.validate_password_sync(errors, password, confirm_password)
-        socket_io.emit(
-            "validation",
-            {"errors": errors, "success": len(errors) == 0},
-            namespace="/validate-register",
-        )
+        return {"errors": errors, "success": len(errors) == 0}
+
+    validator = DebouncedValidator(
+        socket_io, "/validate-register", _do_validation, validation_debounce_ms / 1000
+    )
 
     @socket_io.on("connect", namespace="/validate-register")
     def handle_connect():
@@ -29,8 +30,9 @@ def register_validate_register_socketio_events(socket_io: SocketIO):
 
     @socket_io.on("disconnect", namespace="/validate-register")
     def handle_disconnect():
+        validator.drop(request.sid)
         print(f"User disconnected from IP: {request.remote_addr}")
 
     @socket_io.on("validation", namespace="/validate-register")
     def handle_validation(data):
-        socket_io.start_background_task(_do_validation, data)
+        validator.submit(request.sid, data)
@@ -9,3 +9,18 @@ from .generate_etag import *
 from .validation import *
 from .generate_otp import *
 from .ai_generator import *
+from .socket_state import *
+from .socket_channels import *
+from .background_pool import *
+from .generation_tracker import *
+from .idempotency import *
+from .socket_payloads import *
+from .timer_wheel import *
+from .countdown_scheduler import *
+from .debounced_validator import *
+from .email_deliverability import *
+from .token_auth_cache import *
+from .revocation import *
+from .password_hasher import *
+from .google_identity import *
+from .query_counter import *
@@ -1,7 +1,7 @@
 import time
 import base64
 import urllib.parse
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Callable
 from google import genai
 import requests
 from imagekitio import ImageKit
@@ -345,6 +345,7 @@ answer NO.
         prompt: str,
         image_generator: ImageKitImageGenerator,
         referenced_file: Union[None, str, bytes] = None,
+        on_progress: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         prompt = (prompt or "").strip()
         if not prompt:
@@ -378,6 +379,9 @@ Prompt ini belum cukup jelas untuk membuat gambar. Tolong minta mereka menjelask
             )
             return {"is_image": False, "content": fallback_text}
 
+        if on_progress is not None:
+            on_progress("generating_image")
+
         try:
             image_url = image_generator.generate_image(prompt)
         except Exception as e:
@@ -414,6 +418,7 @@ Namun sistem tidak dapat membuat gambar tersebut sekarang.
         instruction_for_doc: str = (
             "Ringkas isi dokumen ini dan jelaskan poin-poin pentingnya dalam bahasa Indonesia."
         ),
+        on_progress: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         Flow utama sesuai permintaan:
@@ -428,7 +433,9 @@ Namun sistem tidak dapat membuat gambar tersebut sekarang.
         if prompt:
             mode = self.get_prompt_mode(prompt)
             if mode == "IMAGE":
-                return self.handle_image_prompt(prompt, image_generator)
+                return self.handle_image_prompt(
+                    prompt, image_generator, on_progress=on_progress
+                )
 
             if self.prompt_requests_file_analysis(prompt):
                 if file_input is not None:
@@ -1,43 +1,110 @@
 import jwt
+import uuid
+import datetime as dt
+from ..config import access_token_ttl, refresh_token_ttl
+from ..dataclasses import AccessTokenSchema
 
 
 class AuthJwt:
     @staticmethod
-    async def generate_jwt_async(user_id, datetime):
-        from .. import private_key
+    def _encode(payload):
+        from .. import private_key, jwt_algorithm, jwt_key_id
 
-        payload = {"sub": user_id, "iat": datetime}
-        token = jwt.encode(payload, private_key, algorithm="RS256")
-        return token
+        return jwt.encode(
+            payload, private_key, algorithm=jwt_algorithm, headers={"kid": jwt_key_id}
+        )
 
     @staticmethod
-    def generate_jwt_sync(user_id, datetime):
-        from .. import private_key
-
-        payload = {"sub": user_id, "iat": datetime}
-        token = jwt.encode(payload, private_key, algorithm="RS256")
-        return token
-
-    @staticmethod
-    async def verify_token_async(token):
-        from .. import public_key
+    def _decode(token, token_type="access"):
+        from .. import verification_keys, jwt_key_id
 
         try:
-            payload = jwt.decode(token, public_key, algorithms=["RS256"])
-            return payload
+            kid = jwt.get_unverified_header(token).get("kid") or jwt_key_id
+            if not (verification_key := verification_keys.get(kid)):
+                return None
+            key, algorithm = verification_key
+            payload = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                options={"require": ["sub", "iat", "exp", "jti"]},
+            )
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        if payload.get("type") != token_type:
+            return None
+        return payload
 
     @staticmethod
-    def verify_token_sync(token):
-        from .. import public_key
+    def _access_payload(user_id, datetime, family, token_version):
+        return {
+            "sub": user_id,
+            "ver": token_version,
+            "iat": datetime,
+            "exp": datetime + dt.timedelta(seconds=access_token_ttl),
+            "jti": uuid.uuid4().hex,
+            "fam": family,
+            "type": "access",
+        }
 
-        try:
-            payload = jwt.decode(token, public_key, algorithms=["RS256"])
-            return payload
-        except jwt.ExpiredSignatureError:
-            return None
-        except jwt.InvalidTokenError:
+    @staticmethod
+    async def generate_jwt_async(user_id, datetime, family=None, token_version=0):
+        return AuthJwt._encode(
+            AuthJwt._access_payload(user_id, datetime, family, token_version)
+        )
+
+    @staticmethod
+    def generate_jwt_sync(user_id, datetime, family=None, token_version=0):
+        return AuthJwt._encode(
+            AuthJwt._access_payload(user_id, datetime, family, token_version)
+        )
+
+    @staticmethod
+    async def generate_refresh_jwt_async(user_id, datetime, family):
+        from ..databases import RefreshTokenDatabase
+
+        jti = uuid.uuid4().hex
+        expired_at = datetime + dt.timedelta(seconds=refresh_token_ttl)
+        if not await RefreshTokenDatabase.insert(user_id, jti, family, expired_at):
             return None
+        return AuthJwt._encode(
+            {
+                "sub": user_id,
+                "iat": datetime,
+                "exp": expired_at,
+                "jti": jti,
+                "fam": family,
+                "type": "refresh",
+            }
+        )
+
+    @staticmethod
+    async def generate_token_pair_async(
+        user_id, datetime, family=None, token_version=0
+    ):
+        family = family or uuid.uuid4().hex
+        access_token = await AuthJwt.generate_jwt_async(
+            user_id, datetime, family, token_version
+        )
+        refresh_token = await AuthJwt.generate_refresh_jwt_async(
+            user_id, datetime, family
+        )
+        return AccessTokenSchema(
+            access_token=access_token,
+            created_at=datetime,
+            refresh_token=refresh_token,
+        )
+
+    @staticmethod
+    async def verify_token_async(token):
+        return AuthJwt._decode(token)
+
+    @staticmethod
+    def verify_token_sync(token):
+        return AuthJwt._decode(token)
+
+    @staticmethod
+    async def verify_refresh_token_async(token):
+        return AuthJwt._decode(token, "refresh")
@@ -0,0 +1,36 @@
+import collections
+import threading
+
+
+class BackgroundWorkerPool:
+    def __init__(self, socket_io, max_workers):
+        self.socket_io = socket_io
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.turns = threading.Condition()
+        self.queues = {}
+
+    def submit(self, func, *args, serial_key=None, **kwargs):
+        turn = object()
+        if serial_key is not None:
+            with self.turns:
+                self.queues.setdefault(serial_key, collections.deque()).append(turn)
+        return self.socket_io.start_background_task(
+            self._run, serial_key, turn, func, *args, **kwargs
+        )
+
+    def _run(self, serial_key, turn, func, *args, **kwargs):
+        try:
+            if serial_key is not None:
+                with self.turns:
+                    while self.queues[serial_key][0] is not turn:
+                        self.turns.wait()
+            with self.slots:
+                return func(*args, **kwargs)
+        finally:
+            if serial_key is not None:
+                with self.turns:
+                    queue = self.queues[serial_key]
+                    queue.remove(turn)
+                    if not queue:
+                        del self.queues[serial_key]
+                    self.turns.notify_all()
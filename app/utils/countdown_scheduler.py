@@ -0,0 +1,105 @@
+import math
+import threading
+import time
+import traceback
+from .timer_wheel import TimerWheel
+
+COUNTDOWN_MILESTONES = (30, 10)
+
+
+def next_milestone(remaining):
+    if remaining > 60:
+        return (math.ceil(remaining / 60) - 1) * 60
+    for milestone in COUNTDOWN_MILESTONES:
+        if remaining > milestone:
+            return milestone
+    return 0
+
+
+class CountdownScheduler:
+    def __init__(self, socket_io):
+        self.socket_io = socket_io
+        self.namespaces = {}
+        self.countdowns = {}
+        self.lock = threading.Lock()
+        self.wheel = TimerWheel(int(time.time()))
+        self.running = False
+
+    def register_namespace(self, namespace, on_expire, expired_payload):
+        self.namespaces[namespace] = (on_expire, expired_payload)
+
+    def schedule(self, namespace, room, token, expired_time):
+        countdown = {
+            "namespace": namespace,
+            "room": room,
+            "token": token,
+            "expired_time": expired_time,
+        }
+        remaining = expired_time - time.time()
+        with self.lock:
+            if not self.running:
+                self.wheel.current_tick = int(time.time())
+            self.countdowns[room] = countdown
+            self.wheel.schedule(
+                math.ceil(expired_time - next_milestone(remaining)), countdown
+            )
+            if self.running:
+                return
+            self.running = True
+        self.socket_io.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socket_io.sleep(1)
+            try:
+                self._tick()
+            except Exception:
+                traceback.print_exc()
+            with self.lock:
+                if not self.countdowns:
+                    self.running = False
+                    return
+
+    def _tick(self):
+        now = time.time()
+        expired = {}
+        with self.lock:
+            for countdown in self.wheel.advance(int(now)):
+                room = countdown["room"]
+                if self.countdowns.get(room) is not countdown:
+                    continue
+                remaining = round(countdown["expired_time"] - now)
+                if remaining <= 0:
+                    del self.countdowns[room]
+                    expired.setdefault(countdown["namespace"], []).append(countdown)
+                    continue
+                self.wheel.schedule(
+                    math.ceil(countdown["expired_time"] - next_milestone(remaining)),
+                    countdown,
+                )
+                self.socket_io.emit(
+                    "countdown",
+                    {"remaining": remaining},
+                    room=room,
+                    namespace=countdown["namespace"],
+                )
+
+        for namespace, countdowns in expired.items():
+            on_expire, expired_payload = self.namespaces[namespace]
+            try:
+                on_expire([countdown["token"] for countdown in countdowns])
+            except Exception:
+                traceback.print_exc()
+            for countdown in countdowns:
+                self.socket_io.emit(
+                    "countdown",
+                    {"remaining": 0},
+                    room=countdown["room"],
+                    namespace=namespace,
+                )
+                self.socket_io.emit(
+                    "expired",
+                    expired_payload,
+                    room=countdown["room"],
+                    namespace=namespace,
+                )
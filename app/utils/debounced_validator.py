@@ -0,0 +1,46 @@
+import threading
+import traceback
+
+
+class DebouncedValidator:
+    def __init__(self, socket_io, namespace, validate, delay=0.15):
+        self.socket_io = socket_io
+        self.namespace = namespace
+        self.validate = validate
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.workers = set()
+
+    def submit(self, sid, data):
+        with self.lock:
+            self.pending[sid] = data
+            if sid in self.workers:
+                return
+            self.workers.add(sid)
+        self.socket_io.start_background_task(self._run, sid)
+
+    def drop(self, sid):
+        with self.lock:
+            self.pending.pop(sid, None)
+            self.workers.discard(sid)
+
+    def _run(self, sid):
+        while True:
+            self.socket_io.sleep(self.delay)
+            with self.lock:
+                if sid not in self.workers:
+                    return
+                if sid not in self.pending:
+                    self.workers.discard(sid)
+                    return
+                data = self.pending.pop(sid)
+            try:
+                result = self.validate(data)
+            except Exception:
+                traceback.print_exc()
+                continue
+            with self.lock:
+                if sid not in self.workers:
+                    return
+            self.socket_io.emit("validation", result, namespace=self.namespace, to=sid)
@@ -0,0 +1,62 @@
+import threading
+import time
+from email_validator import EmailUndeliverableError
+from email_validator.deliverability import (
+    caching_resolver,
+    validate_email_deliverability,
+)
+from ..config import email_dns_timeout, email_deliverable_ttl, email_undeliverable_ttl
+
+
+class EmailDeliverability:
+    def __init__(
+        self,
+        timeout=2,
+        positive_ttl=6 * 60 * 60,
+        negative_ttl=10 * 60,
+        max_entries=10000,
+    ):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.resolver = caching_resolver(timeout=timeout)
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def is_deliverable(self, domain, domain_i18n=None):
+        domain = domain.lower()
+        now = time.monotonic()
+        with self.lock:
+            if (cached := self.cache.get(domain)) and cached[0] > now:
+                return cached[1]
+        try:
+            info = validate_email_deliverability(
+                domain,
+                domain_i18n or domain,
+                dns_resolver=self.resolver,
+            )
+        except EmailUndeliverableError:
+            self._store(domain, False, now + self.negative_ttl)
+            return False
+        if "unknown-deliverability" in info:
+            return True
+        self._store(domain, True, now + self.positive_ttl)
+        return True
+
+    def _store(self, domain, deliverable, expires_at):
+        with self.lock:
+            if len(self.cache) >= self.max_entries:
+                now = time.monotonic()
+                self.cache = {
+                    key: value for key, value in self.cache.items() if value[0] > now
+                }
+                while len(self.cache) >= self.max_entries:
+                    self.cache.pop(next(iter(self.cache)))
+            self.cache[domain] = (expires_at, deliverable)
+
+
+email_deliverability = EmailDeliverability(
+    timeout=email_dns_timeout,
+    positive_ttl=email_deliverable_ttl,
+    negative_ttl=email_undeliverable_ttl,
+)
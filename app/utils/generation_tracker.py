@@ -0,0 +1,43 @@
+import threading
+
+
+class GenerationTask:
+    __slots__ = ("room", "message_id", "cancelled", "killable", "thread")
+
+    def __init__(self, room, message_id):
+        self.room = room
+        self.message_id = message_id
+        self.cancelled = threading.Event()
+        self.killable = False
+        self.thread = None
+
+    def cancel(self):
+        self.cancelled.set()
+        green_thread = getattr(self.thread, "g", None)
+        if self.killable and green_thread is not None:
+            green_thread.kill()
+
+
+class GenerationTracker:
+    def __init__(self):
+        self.tasks = {}
+
+    def register(self, sid, room, message_id):
+        task = GenerationTask(room, message_id)
+        self.tasks.setdefault(sid, {})[message_id] = task
+        return task
+
+    def finish(self, sid, message_id):
+        if sid_tasks := self.tasks.get(sid):
+            sid_tasks.pop(message_id, None)
+            if not sid_tasks:
+                self.tasks.pop(sid, None)
+
+    def cancel(self, sid, room=None):
+        cancelled = []
+        for task in list(self.tasks.get(sid, {}).values()):
+            if room and task.room != room:
+                continue
+            cancelled.append(task.message_id)
+            task.cancel()
+        return cancelled
@@ -0,0 +1,120 @@
+import hashlib
+import re
+import threading
+import time
+import jwt
+import requests
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from ..config import google_client_id, google_userinfo_ttl, google_http_timeout
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+
+class GoogleIdentity:
+    def __init__(
+        self,
+        client_ids=(),
+        userinfo_ttl=5 * 60,
+        timeout=5,
+        max_entries=10000,
+        certs_url=GOOGLE_CERTS_URL,
+        userinfo_url=GOOGLE_USERINFO_URL,
+    ):
+        self.client_ids = list(client_ids)
+        self.userinfo_ttl = userinfo_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.certs_url = certs_url
+        self.userinfo_url = userinfo_url
+        self.session = requests.Session()
+        self.certs = {}
+        self.certs_expires_at = 0
+        self.certs_fetched_at = 0
+        self.userinfo = {}
+        self.lock = threading.Lock()
+
+    def get_profile(self, token):
+        if not self.client_ids:
+            return self.fetch_userinfo(token)
+        try:
+            jwt.get_unverified_header(token)
+        except jwt.DecodeError:
+            # Not a JWT, so an OAuth access token for the userinfo endpoint.
+            return self.fetch_userinfo(token)
+        return self.verify_id_token(token)
+
+    def verify_id_token(self, token):
+        try:
+            claims = self._decode(token, self._get_certs())
+        except google_exceptions.MalformedError:
+            if time.monotonic() - self.certs_fetched_at < 60:
+                return None
+            try:
+                claims = self._decode(token, self._get_certs(force=True))
+            except (ValueError, requests.RequestException):
+                return None
+        except (ValueError, requests.RequestException):
+            return None
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            return None
+        if claims.get("email_verified") is False:
+            return None
+        return claims
+
+    def _decode(self, token, certs):
+        return google_jwt.decode(token, certs=certs, audience=self.client_ids)
+
+    def _get_certs(self, force=False):
+        now = time.monotonic()
+        if not force and self.certs and self.certs_expires_at > now:
+            return self.certs
+        with self.lock:
+            if not force and self.certs and self.certs_expires_at > now:
+                return self.certs
+            response = self.session.get(self.certs_url, timeout=self.timeout)
+            response.raise_for_status()
+            max_age = re.search(
+                r"max-age=(\d+)", response.headers.get("Cache-Control", "")
+            )
+            self.certs = response.json()
+            self.certs_fetched_at = now
+            self.certs_expires_at = now + (int(max_age.group(1)) if max_age else 3600)
+            return self.certs
+
+    def fetch_userinfo(self, token):
+        key = hashlib.sha256(token.encode()).hexdigest()
+        now = time.monotonic()
+        if (cached := self.userinfo.get(key)) and cached[0] > now:
+            return cached[1]
+        try:
+            response = self.session.get(
+                self.userinfo_url,
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        profile = response.json()
+        with self.lock:
+            if len(self.userinfo) >= self.max_entries:
+                self.userinfo = {
+                    key: value for key, value in self.userinfo.items() if value[0] > now
+                }
+                while len(self.userinfo) >= self.max_entries:
+                    self.userinfo.pop(next(iter(self.userinfo)))
+            self.userinfo[key] = (now + self.userinfo_ttl, profile)
+        return profile
+
+
+google_identity = GoogleIdentity(
+    client_ids=[
+        client_id.strip() for client_id in google_client_id.split(",") if client_id
+    ],
+    userinfo_ttl=google_userinfo_ttl,
+    timeout=google_http_timeout,
+)
@@ -0,0 +1,3 @@
+from .idempotency_store import *
+from .memory_idempotency_store import *
+from .redis_idempotency_store import *
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class IdempotencyStore(ABC):
+    @abstractmethod
+    def begin(self, key, record):
+        pass
+
+    @abstractmethod
+    def complete(self, key, record):
+        pass
+
+    @abstractmethod
+    def discard(self, key):
+        pass
@@ -0,0 +1,31 @@
+import time
+from .idempotency_store import IdempotencyStore
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, ttl=10 * 60, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.records = {}
+
+    def _purge(self, now):
+        for key, (expires_at, _) in list(self.records.items()):
+            if expires_at <= now:
+                del self.records[key]
+
+    def begin(self, key, record):
+        now = time.monotonic()
+        if len(self.records) >= self.max_entries:
+            self._purge(now)
+        if existing := self.records.get(key):
+            expires_at, existing_record = existing
+            if expires_at > now:
+                return existing_record
+        self.records[key] = (now + self.ttl, record)
+        return None
+
+    def complete(self, key, record):
+        self.records[key] = (time.monotonic() + self.ttl, record)
+
+    def discard(self, key):
+        self.records.pop(key, None)
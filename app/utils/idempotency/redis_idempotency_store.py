@@ -0,0 +1,28 @@
+import json
+import redis
+from .idempotency_store import IdempotencyStore
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    def __init__(self, url, ttl=10 * 60, prefix="idempotency"):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def begin(self, key, record):
+        with self.client.pipeline() as pipe:
+            pipe.set(self._key(key), json.dumps(record), nx=True, ex=self.ttl)
+            pipe.get(self._key(key))
+            created, existing = pipe.execute()
+        if created:
+            return None
+        return json.loads(existing) if existing else None
+
+    def complete(self, key, record):
+        self.client.set(self._key(key), json.dumps(record), ex=self.ttl)
+
+    def discard(self, key):
+        self.client.delete(self._key(key))
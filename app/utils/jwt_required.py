@@ -1,9 +1,7 @@
 import inspect
 from functools import wraps
 from flask import request, jsonify
-from ..utils import AuthJwt
-import datetime
-from ..models import UserModel, BlacklistTokenModel
+from .token_auth_cache import token_auth_cache
 
 
 def jwt_required():
@@ -28,31 +26,9 @@ def jwt_required():
                 return jsonify({"message": "invalid authorization header"}), 401
 
             token = auth_header.split()[1]
-            payload = AuthJwt.verify_token_sync(token)
-            if payload is None:
-                return jsonify({"message": "invalid or expired token"}), 401
-
-            user_id = payload.get("sub")
-            if not user_id:
-                return jsonify({"message": "invalid or expired token"}), 401
-
-            user = UserModel.objects(id=user_id).first()
-            if not user:
-                return jsonify({"message": "invalid or expired token"}), 401
-
-            iat = payload.get("iat")
-            issued_time = datetime.datetime.fromtimestamp(iat, tz=datetime.timezone.utc)
-            ua = user.updated_at
-            if ua.tzinfo is None:
-                ua = ua.replace(tzinfo=datetime.timezone.utc)
-
-            SKEW = datetime.timedelta(seconds=60)
-            if ua and (issued_time + SKEW) < ua:
-                return jsonify({"message": "invalid or expired token"}), 401
-
-            jti = payload.get("jti")
-            if jti and BlacklistTokenModel.objects(jti=jti).first():
+            if not (result := token_auth_cache.authenticate(token)):
                 return jsonify({"message": "invalid or expired token"}), 401
+            payload, user = result
 
             if not user.is_active:
                 return jsonify({"message": "user is not active"}), 401
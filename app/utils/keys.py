@@ -1,4 +1,30 @@
+import base64
+import glob
+import hashlib
 import os
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
+
+def key_algorithm(key):
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if algorithm := EC_ALGORITHMS.get(key.curve.name):
+            return algorithm
+        raise ValueError(f"unsupported EC curve {key.curve.name}")
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"unsupported key type {type(key).__name__}")
+
+
+def key_id(public_key):
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.urlsafe_b64encode(hashlib.sha256(der).digest()[:12]).decode()
 
 
 def load_key_pair(base_dir: str):
@@ -6,8 +32,17 @@ def load_key_pair(base_dir: str):
     public_key_path = os.path.join(base_dir, "keys", "public.pem")
 
     with open(private_key_path, "rb") as f:
-        private_key = f.read()
+        private_key = serialization.load_pem_private_key(f.read(), password=None)
     with open(public_key_path, "rb") as f:
-        public_key = f.read()
+        public_key = serialization.load_pem_public_key(f.read())
 
     return private_key, public_key
+
+
+def load_verification_keys(base_dir: str, public_key):
+    verification_keys = {key_id(public_key): (public_key, key_algorithm(public_key))}
+    for path in sorted(glob.glob(os.path.join(base_dir, "keys", "verify", "*.pem"))):
+        with open(path, "rb") as f:
+            key = serialization.load_pem_public_key(f.read())
+        verification_keys[key_id(key)] = (key, key_algorithm(key))
+    return verification_keys
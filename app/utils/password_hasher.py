@@ -0,0 +1,47 @@
+import bcrypt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ..config import bcrypt_log_rounds, password_hash_workers
+
+
+class PasswordHasher:
+    def __init__(self, log_rounds=12, max_workers=4):
+        self.log_rounds = log_rounds
+        self.max_workers = max_workers
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.executor = None
+
+    def _run(self, func, *args):
+        try:
+            from eventlet import patcher, tpool
+        except ImportError:
+            patcher = None
+        if patcher is not None and patcher.is_monkey_patched("thread"):
+            with self.slots:
+                return tpool.execute(func, *args)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="password-hasher"
+            )
+        return self.executor.submit(func, *args).result()
+
+    def generate_password_hash(self, password):
+        return self._run(
+            bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.log_rounds)
+        ).decode("utf-8")
+
+    def check_password_hash(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(
+            bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8")
+        )
+
+    def needs_rehash(self, password_hash):
+        try:
+            return int(password_hash.split("$")[2]) != self.log_rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+
+password_hasher = PasswordHasher(bcrypt_log_rounds, password_hash_workers)
@@ -0,0 +1,45 @@
+import contextvars
+from pymongo import monitoring
+
+
+class QueryCounter(monitoring.CommandListener):
+    """Counts MongoDB commands issued within the current context.
+
+    Registered globally with pymongo, so it sees both the mongoengine client
+    and the async client. Only contexts that called ``start`` are counted.
+    """
+
+    IGNORED = frozenset(
+        {"hello", "ismaster", "isMaster", "ping", "endSessions", "killCursors"}
+    )
+
+    def __init__(self):
+        self.counts = contextvars.ContextVar("query_counts", default=None)
+
+    def start(self):
+        counts = {}
+        self.counts.set(counts)
+        return counts
+
+    def stop(self):
+        counts = self.counts.get()
+        self.counts.set(None)
+        return counts
+
+    def total(self):
+        return sum((self.counts.get() or {}).values())
+
+    def started(self, event):
+        counts = self.counts.get()
+        if counts is not None and event.command_name not in self.IGNORED:
+            counts[event.command_name] = counts.get(event.command_name, 0) + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+query_counter = QueryCounter()
+monitoring.register(query_counter)
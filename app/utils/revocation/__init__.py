@@ -0,0 +1,3 @@
+from .bloom_filter import *
+from .revocation_filter import *
+from .redis_revocation_filter import *
@@ -0,0 +1,46 @@
+import redis
+import traceback
+from .revocation_filter import RevocationFilter
+
+
+class RedisRevocationFilter(RevocationFilter):
+    def __init__(
+        self,
+        socket_io,
+        url,
+        capacity=100000,
+        error_rate=0.001,
+        channel="chat-bot:revoked-tokens",
+    ):
+        super().__init__(capacity, error_rate)
+        self.socket_io = socket_io
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.channel = channel
+        self.pubsub = None
+
+    def _ensure_loaded(self):
+        if self.bloom is None:
+            with self.lock:
+                if self.bloom is None:
+                    self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    self.pubsub.subscribe(self.channel)
+                    self.socket_io.start_background_task(self._listen)
+                    self.rebuild()
+
+    def _listen(self):
+        while True:
+            try:
+                for message in self.pubsub.listen():
+                    if message["type"] == "message":
+                        self._add_local(message["data"])
+            except redis.ConnectionError:
+                traceback.print_exc()
+                self.socket_io.sleep(1)
+                with self.lock:
+                    self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    self.pubsub.subscribe(self.channel)
+                    self.rebuild()
+
+    def add(self, key):
+        self._add_local(key)
+        self.client.publish(self.channel, key)
@@ -0,0 +1,50 @@
+import threading
+from .bloom_filter import BloomFilter
+
+
+def revocation_key(payload):
+    return payload.get("jti") or f"{payload.get('sub')}:{payload.get('iat')}"
+
+
+class RevocationFilter:
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = None
+        self.lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self.bloom is None:
+            with self.lock:
+                if self.bloom is None:
+                    self.rebuild()
+
+    def rebuild(self):
+        from ...models import BlacklistTokenModel
+
+        keys = [
+            document.jti or f"{document.user.id}:{document.created_at}"
+            for document in BlacklistTokenModel.objects.only(
+                "jti", "user", "created_at"
+            ).no_dereference()
+        ]
+        self.capacity = max(self.capacity, len(keys) * 2)
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for key in keys:
+            bloom.add(key)
+        self.bloom = bloom
+
+    def _add_local(self, key):
+        self._ensure_loaded()
+        self.bloom.add(key)
+        if self.bloom.count > self.capacity:
+            with self.lock:
+                self.capacity *= 2
+                self.rebuild()
+
+    def add(self, key):
+        self._add_local(key)
+
+    def might_contain(self, key):
+        self._ensure_loaded()
+        return key in self.bloom
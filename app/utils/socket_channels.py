@@ -0,0 +1,2 @@
+def user_channel(user_id):
+    return f"user-{user_id}"
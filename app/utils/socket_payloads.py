@@ -0,0 +1,4 @@
+def chat_batch(items):
+    if len(items) == 1:
+        return items[0]
+    return {"type": "batch", "items": items}
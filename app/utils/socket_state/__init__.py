@@ -0,0 +1,3 @@
+from .socket_state import *
+from .memory_socket_state import *
+from .redis_socket_state import *
@@ -0,0 +1,34 @@
+from .socket_state import SocketState
+
+
+class MemorySocketState(SocketState):
+    def __init__(self):
+        self.sid_room = {}
+        self.sid_session = {}
+        self.room_has_system = set()
+
+    def add_session(self, sid, session, room):
+        self.sid_session[sid] = session
+        self.sid_room[sid] = room
+
+    def get_room(self, sid):
+        return self.sid_room.get(sid)
+
+    def set_room(self, sid, room):
+        self.sid_room[sid] = room
+
+    def get_session(self, sid):
+        return self.sid_session.get(sid)
+
+    def remove_session(self, sid):
+        self.sid_room.pop(sid, None)
+        self.sid_session.pop(sid, None)
+
+    def mark_system_message(self, room):
+        self.room_has_system.add(room)
+
+    def clear_system_message(self, room):
+        if room in self.room_has_system:
+            self.room_has_system.discard(room)
+            return True
+        return False
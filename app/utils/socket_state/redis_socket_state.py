@@ -0,0 +1,64 @@
+import redis
+from .socket_state import SocketState
+from ...dataclasses import SocketSessionSchema
+
+
+class RedisSocketState(SocketState):
+    def __init__(self, url, ttl=24 * 60 * 60, prefix="chat-bot"):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _sid_key(self, sid):
+        return f"{self.prefix}:sid:{sid}"
+
+    def _room_key(self, room):
+        return f"{self.prefix}:room:{room}"
+
+    def add_session(self, sid, session, room):
+        key = self._sid_key(sid)
+        with self.client.pipeline() as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "user_id": session.user_id,
+                    "is_active": int(session.is_active),
+                    "iat": session.iat,
+                    "room": room,
+                },
+            )
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+    def get_room(self, sid):
+        return self.client.hget(self._sid_key(sid), "room")
+
+    def set_room(self, sid, room):
+        key = self._sid_key(sid)
+        with self.client.pipeline() as pipe:
+            pipe.hset(key, "room", room)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+    def get_session(self, sid):
+        user_id, is_active, iat = self.client.hmget(
+            self._sid_key(sid), "user_id", "is_active", "iat"
+        )
+        if user_id is None:
+            return None
+        return SocketSessionSchema(
+            user_id=user_id, is_active=is_active == "1", iat=int(iat or 0)
+        )
+
+    def remove_session(self, sid):
+        self.client.delete(self._sid_key(sid))
+
+    def mark_system_message(self, room):
+        key = self._room_key(room)
+        with self.client.pipeline() as pipe:
+            pipe.hset(key, "has_system", 1)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+    def clear_system_message(self, room):
+        return bool(self.client.hdel(self._room_key(room), "has_system"))
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+
+
+class SocketState(ABC):
+    @abstractmethod
+    def add_session(self, sid, session, room):
+        pass
+
+    @abstractmethod
+    def get_room(self, sid):
+        pass
+
+    @abstractmethod
+    def set_room(self, sid, room):
+        pass
+
+    @abstractmethod
+    def get_session(self, sid):
+        pass
+
+    @abstractmethod
+    def remove_session(self, sid):
+        pass
+
+    @abstractmethod
+    def mark_system_message(self, room):
+        pass
+
+    @abstractmethod
+    def clear_system_message(self, room):
+        pass
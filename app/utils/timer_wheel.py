@@ -0,0 +1,43 @@
+class TimerWheel:
+    def __init__(self, current_tick, slots=60):
+        self.slots = slots
+        self.current_tick = current_tick
+        self.seconds = [[] for _ in range(slots)]
+        self.minutes = [[] for _ in range(slots)]
+        self.overflow = []
+
+    def schedule(self, fire_at, item):
+        fire_at = max(fire_at, self.current_tick + 1)
+        delta = fire_at - self.current_tick
+        if delta < self.slots:
+            self.seconds[fire_at % self.slots].append((fire_at, item))
+        elif delta < self.slots * self.slots:
+            self.minutes[(fire_at // self.slots) % self.slots].append((fire_at, item))
+        else:
+            self.overflow.append((fire_at, item))
+
+    def advance(self, now_tick):
+        due = []
+        while self.current_tick < now_tick:
+            self.current_tick += 1
+            tick = self.current_tick
+            if tick % (self.slots * self.slots) == 0:
+                overflow, self.overflow = self.overflow, []
+                self._cascade(overflow, tick, due)
+            if tick % self.slots == 0:
+                slot = self.minutes[(tick // self.slots) % self.slots]
+                self.minutes[(tick // self.slots) % self.slots] = []
+                self._cascade(slot, tick, due)
+            slot = self.seconds[tick % self.slots]
+            self.seconds[tick % self.slots] = []
+            self._cascade(slot, tick, due)
+        return due
+
+    def _cascade(self, entries, tick, due):
+        # schedule() clamps to the next tick, so entries due now go straight
+        # to due instead of firing a tick late.
+        for fire_at, item in entries:
+            if fire_at <= tick:
+                due.append(item)
+            else:
+                self.schedule(fire_at, item)
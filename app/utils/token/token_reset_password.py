@@ -1,33 +1,31 @@
+import functools
 from .token import Token
 from itsdangerous.url_safe import URLSafeSerializer
 from ...config import salt_reset_password, secret_key_reset_password
 
 
+@functools.cache
+def reset_password_serializer():
+    return URLSafeSerializer(secret_key_reset_password, salt=salt_reset_password)
+
+
 class TokenResetPassword(Token):
     @staticmethod
     async def insert(user_id, created_at):
-        s = URLSafeSerializer(secret_key_reset_password, salt=salt_reset_password)
-        token = s.dumps({"user_id": user_id, "created_at": created_at})
-        return token
+        return reset_password_serializer().dumps(
+            {"user_id": user_id, "created_at": created_at}
+        )
 
     @staticmethod
     async def get(token):
-        s = URLSafeSerializer(secret_key_reset_password, salt=salt_reset_password)
-        try:
-            s.loads(token)["user_id"]
-            s.loads(token)["created_at"]
-        except:
-            return None
-        else:
-            return s.loads(token)
+        return TokenResetPassword.get_sync(token)
 
     @staticmethod
     def get_sync(token):
-        s = URLSafeSerializer(secret_key_reset_password, salt=salt_reset_password)
         try:
-            s.loads(token)["user_id"]
-            s.loads(token)["created_at"]
-        except:
+            data = reset_password_serializer().loads(token)
+            data["user_id"]
+            data["created_at"]
+        except Exception:
             return None
-        else:
-            return s.loads(token)
+        return data
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from mongoengine import signals
+from .auth_jwt import AuthJwt
+from .revocation import revocation_key
+from ..config import auth_cache_ttl
+from ..models import UserModel, BlacklistTokenModel
+
+
+class TokenAuthCache:
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.user_tokens = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def token_key(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def authenticate(self, token):
+        key = self.token_key(token)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry[0] > now:
+            _, payload, snapshot = entry
+            return payload, UserModel._from_son(dict(snapshot), created=False)
+
+        if not (result := self._verify(token)):
+            return None
+        payload, user = result
+        snapshot = user.to_mongo().to_dict()
+        snapshot.pop("password", None)
+        ttl = min(self.ttl, payload["exp"] - time.time())
+        self._store(key, f"{user.id}", (now + ttl, payload, snapshot))
+        return payload, user
+
+    def _verify(self, token):
+        payload = AuthJwt.verify_token_sync(token)
+        if payload is None:
+            return None
+
+        user_id = payload.get("sub")
+        if not user_id:
+            return None
+
+        user = UserModel.objects(id=user_id).first()
+        if not user:
+            return None
+
+        # A password change or reset bumps token_version, which retires
+        # every access token issued before it.
+        if payload.get("ver", 0) != user.token_version:
+            return None
+
+        from .. import revocation_filter
+
+        jti = revocation_key(payload)
+        if (
+            revocation_filter.might_contain(jti)
+            and BlacklistTokenModel.objects(jti=jti).first()
+        ):
+            return None
+
+        return payload, user
+
+    def _store(self, key, user_id, entry):
+        with self.lock:
+            if len(self.entries) >= self.max_entries:
+                self._evict()
+            self.entries[key] = entry
+            self.user_tokens.setdefault(user_id, set()).add(key)
+
+    def _evict(self):
+        now = time.monotonic()
+        for key, entry in list(self.entries.items()):
+            if entry[0] <= now or len(self.entries) >= self.max_entries:
+                self._discard(key)
+
+    def _discard(self, key):
+        if not (entry := self.entries.pop(key, None)):
+            return
+        user_id = f"{entry[2]['_id']}"
+        if keys := self.user_tokens.get(user_id):
+            keys.discard(key)
+            if not keys:
+                del self.user_tokens[user_id]
+
+    def invalidate_token(self, token):
+        with self.lock:
+            self._discard(self.token_key(token))
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for key in self.user_tokens.pop(f"{user_id}", ()):
+                self.entries.pop(key, None)
+
+    def on_user_changed(self, sender, document, **kwargs):
+        self.invalidate_user(document.id)
+
+
+token_auth_cache = TokenAuthCache(ttl=auth_cache_ttl)
+signals.post_save.connect(token_auth_cache.on_user_changed, sender=UserModel)
+signals.post_delete.connect(token_auth_cache.on_user_changed, sender=UserModel)
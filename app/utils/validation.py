@@ -1,6 +1,7 @@
-from email_validator import validate_email
+from email_validator import validate_email, EmailNotValidError
 import re
 from ..config import provider as PROVIDER
+from .email_deliverability import email_deliverability
 from .token import (
     TokenAccountActive,
     TokenResetPassword,
@@ -9,7 +10,7 @@ from .token import (
 
 class Validation:
     @staticmethod
-    async def validate_email_async(errors, email):
+    async def validate_email_async(errors, email, check_deliverability=False):
         if email is None or (isinstance(email, str) and email.strip() == ""):
             errors.setdefault("email", []).append("IS_REQUIRED")
         else:
@@ -20,14 +21,18 @@ class Validation:
             if isinstance(email, str) and len(email) > 50:
                 errors.setdefault("email", []).append("TOO_LONG")
             try:
-                valid = validate_email(email)
+                valid = validate_email(email, check_deliverability=False)
                 email = valid.email
-            except:
+                if check_deliverability and not email_deliverability.is_deliverable(
+                    valid.ascii_domain, valid.domain
+                ):
+                    errors.setdefault("email", []).append("IS_INVALID")
+            except EmailNotValidError:
                 errors.setdefault("email", []).append("IS_INVALID")
         return errors
 
     @staticmethod
-    def validate_email_sync(errors, email):
+    def validate_email_sync(errors, email, check_deliverability=False):
         if email is None or (isinstance(email, str) and email.strip() == ""):
             errors.setdefault("email", []).append("IS_REQUIRED")
         else:
@@ -38,9 +43,13 @@ class Validation:
             if isinstance(email, str) and len(email) > 50:
                 errors.setdefault("email", []).append("TOO_LONG")
             try:
-                valid = validate_email(email)
+                valid = validate_email(email, check_deliverability=False)
                 email = valid.email
-            except:
+                if check_deliverability and not email_deliverability.is_deliverable(
+                    valid.ascii_domain, valid.domain
+                ):
+                    errors.setdefault("email", []).append("IS_INVALID")
+            except EmailNotValidError:
                 errors.setdefault("email", []).append("IS_INVALID")
         return errors
 
@@ -0,0 +1,137 @@
+"""Stored size of chat history and rooms, legacy encoding vs compact.
+
+Builds N synthetic messages, alternating short user prompts with long
+assistant replies, and reports their BSON size as legacy chat_history
+documents (full field names, user, timestamps, empty defaults) and as the
+current ChatHistoryModel encoding. Does the same for the bucket layout and
+for one chat room. Nothing is written to MongoDB.
+
+    python -m benchmarks.chat_storage --messages 1000
+"""
+
+import argparse
+import datetime
+import random
+import bson
+from app.databases.chat_history_store import bucket_message
+from app.models import ChatHistoryModel, ChatRoomModel
+
+VOCABULARY = (
+    "the model returns a response with markdown code example python function "
+    "value data list user room message history index query"
+).split()
+
+
+def sentence(words):
+    return " ".join(random.choice(VOCABULARY) for _ in range(words))
+
+
+def size(documents):
+    return sum(len(bson.encode(document)) for document in documents)
+
+
+def messages(count, room, user):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    legacy, compact = [], []
+    for index in range(count):
+        assistant = index % 2 == 1
+        text = sentence(random.randint(40, 600) if assistant else random.randint(5, 25))
+        role = "assistant" if assistant else "user"
+        _id = bson.ObjectId()
+        legacy.append(
+            {
+                "_id": _id,
+                "text": text,
+                "links": [],
+                "role": role,
+                "is_image": False,
+                "room": room,
+                "user": user,
+                "created_at": now,
+                "updated_at": now,
+                "deleted_at": None,
+            }
+        )
+        compact.append(
+            ChatHistoryModel(id=_id, text=text, role=role, room=room).to_mongo()
+        )
+    return legacy, compact
+
+
+def buckets(legacy, compact, room, user, bucket_size):
+    legacy_buckets, compact_buckets = [], []
+    for start in range(0, len(legacy), bucket_size):
+        chunk = legacy[start : start + bucket_size]
+        legacy_buckets.append(
+            {
+                "_id": chunk[0]["_id"],
+                "room": room,
+                "user": user,
+                "count": len(chunk),
+                "messages": [
+                    {
+                        key: message[key]
+                        for key in ("_id", "text", "links", "role", "is_image")
+                    }
+                    for message in chunk
+                ],
+            }
+        )
+        compact_buckets.append(
+            {
+                "_id": chunk[0]["_id"],
+                "o": room,
+                "n": len(chunk),
+                "m": [
+                    bucket_message(ChatHistoryModel._from_son(son))
+                    for son in compact[start : start + bucket_size]
+                ],
+            }
+        )
+    return legacy_buckets, compact_buckets
+
+
+def report(label, before, after):
+    print(
+        f"{label:<14} {before:>10,} -> {after:>10,} bytes"
+        f" ({100 * (1 - after / before):.0f}% smaller)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--bucket-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    room, user = bson.ObjectId(), bson.ObjectId()
+    legacy, compact = messages(args.messages, room, user)
+    print(f"{args.messages} messages")
+    report("chat_history", size(legacy), size(compact))
+    report("  user", size(legacy[0::2]), size(compact[0::2]))
+    report("  assistant", size(legacy[1::2]), size(compact[1::2]))
+    report(
+        "buckets",
+        *map(size, buckets(legacy, compact, room, user, args.bucket_size)),
+    )
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    legacy_room = {
+        "_id": room,
+        "title": "Room title here",
+        "room": f"room-{bson.ObjectId()}",
+        "user": user,
+        "created_at": now,
+        "updated_at": now,
+        "deleted_at": None,
+    }
+    compact_room = ChatRoomModel(
+        id=room, title=legacy_room["title"], room=legacy_room["room"], user=user
+    ).to_mongo()
+    report("chat_room", size([legacy_room]), size([compact_room]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Sign/verify throughput of the JWT algorithms supported by app.utils.keys.
+
+Compares passing PEM bytes to PyJWT, which parses the key on every call,
+with passing a key object parsed once.
+
+    python -m benchmarks.jwt_algorithms
+"""
+
+import time
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from app.utils.keys import key_algorithm
+
+KEYS = [
+    rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    ec.generate_private_key(ec.SECP256R1()),
+    ec.generate_private_key(ec.SECP384R1()),
+    ed25519.Ed25519PrivateKey.generate(),
+]
+PAYLOAD = {"sub": "66f0c1d2e3a4b5c6d7e8f901", "iat": int(time.time())}
+
+
+def pem(private_key):
+    return (
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+    )
+
+
+def ops_per_second(function, seconds=1.0):
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        function()
+        count += 1
+    return count / elapsed
+
+
+def main():
+    print(f"{'':6} {'key':7} {'sign/s':>8} {'verify/s':>9}")
+    for private_key in KEYS:
+        algorithm = key_algorithm(private_key)
+        private_pem, public_pem = pem(private_key)
+        for label, signing_key, verifying_key in (
+            ("PEM", private_pem, public_pem),
+            ("parsed", private_key, private_key.public_key()),
+        ):
+            token = jwt.encode(PAYLOAD, signing_key, algorithm=algorithm)
+            sign = ops_per_second(
+                lambda: jwt.encode(PAYLOAD, signing_key, algorithm=algorithm)
+            )
+            verify = ops_per_second(
+                lambda: jwt.decode(token, verifying_key, algorithms=[algorithm])
+            )
+            print(f"{algorithm:6} {label:7} {sign:8.0f} {verify:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
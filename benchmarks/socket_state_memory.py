@@ -0,0 +1,117 @@
+"""Per-connection memory of the chat-bot socket state backends.
+
+Connects N sockets to each backend and reports the bytes retained per
+connection. The memory backend is measured with tracemalloc and compares
+keeping the loaded UserModel document per sid (before) with keeping a
+SocketSessionSchema (after). The Redis backend is measured from the
+used_memory delta and compares the earlier user_id/room hash with the
+current one. Redis is skipped when REDIS_URL (or --redis-url) is not
+reachable.
+
+    python -m benchmarks.socket_state_memory --connections 10000
+"""
+
+import argparse
+import datetime
+import gc
+import os
+import tracemalloc
+import uuid
+import redis
+from bson import ObjectId
+from app.dataclasses import SocketSessionSchema
+from app.models import UserModel
+from app.utils.socket_state import MemorySocketState, RedisSocketState
+
+
+def load_user():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return UserModel(
+        id=ObjectId(),
+        username=f"user{uuid.uuid4().hex[:8]}",
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        password="$2b$12$" + "x" * 53,
+        provider="internal",
+        avatar="https://res.cloudinary.com/demo/image/upload/avatar.png",
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def user_document(user):
+    return user
+
+
+def session_record(user):
+    return SocketSessionSchema(
+        user_id=f"{user.id}", is_active=user.is_active, iat=1760000000
+    )
+
+
+def memory_per_connection(count, record):
+    state = MemorySocketState()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        state.add_session(
+            uuid.uuid4().hex[:20], record(load_user()), f"room-{uuid.uuid4().hex}"
+        )
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / count
+
+
+class PreviousRedisSocketState(RedisSocketState):
+    def add_session(self, sid, session, room):
+        key = self._sid_key(sid)
+        with self.client.pipeline() as pipe:
+            pipe.hset(key, mapping={"user_id": session.user_id, "room": room})
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+
+def redis_per_connection(url, count, state_class):
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    state = state_class(url, prefix=prefix)
+    client = state.client
+    baseline = client.info("memory")["used_memory"]
+    sids = [uuid.uuid4().hex[:20] for _ in range(count)]
+    for sid in sids:
+        state.add_session(sid, session_record(load_user()), f"room-{uuid.uuid4().hex}")
+    used = client.info("memory")["used_memory"] - baseline
+    for start in range(0, count, 1000):
+        client.delete(*(state._sid_key(sid) for sid in sids[start : start + 1000]))
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument(
+        "--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    )
+    args = parser.parse_args()
+    count = args.connections
+
+    print(f"{count} connections, bytes per connection")
+    before = memory_per_connection(count, user_document)
+    after = memory_per_connection(count, session_record)
+    print(f"memory  UserModel document   {before:8.0f}")
+    print(f"memory  SocketSessionSchema  {after:8.0f}")
+
+    try:
+        redis.Redis.from_url(args.redis_url).ping()
+    except redis.RedisError as e:
+        print(f"redis   skipped ({e})")
+        return
+    before = redis_per_connection(args.redis_url, count, PreviousRedisSocketState)
+    after = redis_per_connection(args.redis_url, count, RedisSocketState)
+    print(f"redis   user_id/room hash    {before:8.0f}")
+    print(f"redis   session hash         {after:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
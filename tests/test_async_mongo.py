@@ -0,0 +1,96 @@
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+from app.databases.pymongo_async.client import AsyncMongo
+
+# Nothing below needs a server: the client connects lazily, and the
+# coroutines handed to the loop only use asyncio itself.
+HOST = "mongodb://localhost:1/test"
+
+EVENTLET_ROUNDTRIP = textwrap.dedent("""
+    import eventlet
+    eventlet.monkey_patch()
+    import asyncio, time
+    from app.databases.pymongo_async.client import AsyncMongo
+
+    mongo = AsyncMongo(%r)
+
+    async def echo(index):
+        async def handle(reader, writer):
+            writer.write(await reader.read(4))
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"p%%03d" %% index)
+        await writer.drain()
+        data = await reader.read(4)
+        writer.close()
+        server.close()
+        await asyncio.sleep(0.2)
+        return data
+
+    ticks = []
+
+    def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            eventlet.sleep(0.02)
+
+    eventlet.spawn(ticker)
+    results = [asyncio.run(mongo.run(echo(index))) for index in range(3)]
+    assert results == [b"p000", b"p001", b"p002"], results
+    # The loop runs on its own OS thread, so the hub kept serving other
+    # green threads while the round trips were in flight.
+    assert len(ticks) > 10, len(ticks)
+    mongo.close()
+    print("ok")
+    """ % HOST)
+
+
+@pytest.fixture
+def mongo():
+    mongo = AsyncMongo(HOST)
+    yield mongo
+    mongo.close()
+
+
+def test_run_returns_result_from_mongo_loop(mongo):
+    async def where():
+        return asyncio.get_running_loop()
+
+    assert asyncio.run(mongo.run(where())) is mongo.loop
+
+
+def test_run_propagates_exceptions(mongo):
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(mongo.run(fail()))
+
+
+def test_run_after_close_starts_new_loop(mongo):
+    async def where():
+        return asyncio.get_running_loop()
+
+    first = asyncio.run(mongo.run(where()))
+    mongo.close()
+    assert asyncio.run(mongo.run(where())) is not first
+
+
+def test_roundtrip_under_eventlet():
+    completed = subprocess.run(
+        [sys.executable, "-c", EVENTLET_ROUNDTRIP],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "ok"
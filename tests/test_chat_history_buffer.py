@@ -0,0 +1,83 @@
+import mongomock
+import mongoengine as me
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+from flask import Flask
+from app.commands import restore_dropped_chat_history
+from app.databases import ChatHistoryWriteBehind, ChatHistorySpill
+from app.databases import chat_history_buffer as buffer_module
+from app.databases.chat_history_store import DocumentChatHistoryStore
+from app.models import ChatHistoryModel
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    me.connect(
+        "chat-history-buffer",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+    )
+    monkeypatch.setattr(buffer_module, "chat_history_store", DocumentChatHistoryStore())
+    yield ChatHistoryModel._get_collection()
+    me.disconnect()
+
+
+def buffer_with(count, max_retries=5, on_drop=None):
+    buffer = ChatHistoryWriteBehind(None, max_retries=max_retries, on_drop=on_drop)
+    buffer.running = True
+    room = ObjectId()
+    for index in range(count):
+        buffer.add(ChatHistoryModel(text=f"m{index}", role="user", room=room))
+    return buffer
+
+
+def test_partial_write_is_completed_on_retry(collection, monkeypatch):
+    buffer = buffer_with(5)
+    insert_many = collection.insert_many
+
+    def fail_midway(documents, ordered=True):
+        insert_many(documents[:2], ordered=ordered)
+        raise AutoReconnect("connection reset")
+
+    monkeypatch.setattr(type(collection), "insert_many", fail_midway)
+    assert buffer.flush() == 0
+    assert len(buffer.pending) == 5
+    monkeypatch.setattr(type(collection), "insert_many", insert_many.__func__)
+    assert buffer.flush() == 5
+    assert buffer.pending == []
+    assert [son["x"] for son in collection.find().sort("_id", 1)] == [
+        f"m{index}" for index in range(5)
+    ]
+
+
+def test_failed_documents_are_retried_then_dropped(collection, monkeypatch):
+    dropped = []
+    buffer = buffer_with(1, max_retries=2, on_drop=dropped.extend)
+    monkeypatch.setattr(
+        buffer_module.chat_history_store,
+        "insert_many",
+        lambda documents: documents,
+    )
+    assert buffer.flush() == 0
+    assert buffer.flush() == 0
+    assert len(buffer.pending) == 1
+    assert buffer.flush() == 0
+    assert buffer.pending == []
+    assert buffer.attempts == {}
+    assert [document.text for document in dropped] == ["m0"]
+
+
+def test_dropped_documents_are_spilled_and_restored(collection, tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    spill = ChatHistorySpill(str(tmp_path / "chat_history_dropped.jsonl"))
+    buffer = buffer_with(3, on_drop=spill)
+    long_text = "compressed " * 200
+    buffer.pending[0].text = long_text
+    spill(buffer.pending)
+    assert [document.text for document in spill.read()] == [long_text, "m1", "m2"]
+
+    result = app.test_cli_runner().invoke(restore_dropped_chat_history)
+    assert result.output.strip() == "restored 3 messages, 0 left"
+    assert collection.count_documents({}) == 3
+    assert spill.read() == []
@@ -0,0 +1,146 @@
+import mongomock
+import mongoengine as me
+import pytest
+from bson import ObjectId
+from flask import Flask
+from pymongo import UpdateOne
+from app.commands import migrate_chat_history
+from app.databases.chat_history_store import BucketChatHistoryStore, bucket_message
+from app.models import ChatHistoryBucketModel, ChatHistoryModel, ChatRoomModel
+
+
+def bulk_write(self, requests, ordered=True):
+    # mongomock's bulk_write predates the sort option pymongo's UpdateOne now
+    # passes along, so apply the updates one by one.
+    for request in requests:
+        assert isinstance(request, UpdateOne)
+        self.update_one(request._filter, request._doc, upsert=request._upsert)
+
+
+@pytest.fixture
+def room(monkeypatch):
+    me.connect(
+        "chat-history-store",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+    )
+    monkeypatch.setattr(mongomock.Collection, "bulk_write", bulk_write)
+    yield ChatRoomModel(user=ObjectId(), room="room", title="Room").save()
+    me.disconnect()
+
+
+@pytest.fixture
+def cli(room):
+    return Flask(__name__).test_cli_runner()
+
+
+def messages_for(room, count):
+    return [
+        ChatHistoryModel(id=ObjectId(), room=room, role="user", text=f"message {n}")
+        for n in range(count)
+    ]
+
+
+def texts(documents):
+    return [document.text for document in documents]
+
+
+def buckets(room):
+    return list(ChatHistoryBucketModel.objects(room=room).order_by("id"))
+
+
+def test_append_fills_buckets_in_order(room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 7)
+
+    assert store.insert_many(documents[:4]) == []
+    assert store.insert_many(documents[4:]) == []
+
+    assert [bucket.count for bucket in buckets(room)] == [3, 3, 1]
+    assert texts(store.messages(room)) == texts(documents)
+
+
+def test_limit_returns_the_oldest_messages(room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 7)
+    store.insert_many(documents)
+
+    for limit in range(1, 9):
+        assert texts(store.messages(room, limit=limit)) == texts(documents[:limit])
+
+
+def test_limit_reads_overlapping_buckets(room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 4)
+    # Two writers each opened a bucket, then kept appending to their own.
+    for mine in (documents[0::2], documents[1::2]):
+        ChatHistoryBucketModel._get_collection().insert_one(
+            {
+                "_id": mine[0].id,
+                ChatHistoryBucketModel.room.db_field: room.id,
+                ChatHistoryBucketModel.count.db_field: len(mine),
+                ChatHistoryBucketModel.messages.db_field: [
+                    bucket_message(document) for document in mine
+                ],
+            }
+        )
+
+    assert texts(store.messages(room, limit=2)) == texts(documents[:2])
+    assert texts(store.messages(room, limit=3)) == texts(documents[:3])
+
+
+def test_retried_flush_is_deduplicated(room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 4)
+
+    store.insert_many(documents[:3])
+    store.insert_many(documents[2:])
+
+    assert texts(store.messages(room)) == texts(documents)
+    assert texts(store.messages(room, limit=3)) == texts(documents[:3])
+
+
+def test_messages_projects_fields(room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 2)
+    store.insert_many(documents)
+
+    message, _ = store.messages(room, fields=("id", "role"))
+
+    assert message.id == documents[0].id
+    assert message.role == "user"
+    assert message.text is None
+
+
+def test_migrate_then_append(cli, room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    old, new = messages_for(room, 4), messages_for(room, 2)
+    ChatHistoryModel.objects.insert(old)
+    # The layout was switched first, so new messages already live in a bucket.
+    store.insert_many(new[:1])
+
+    result = cli.invoke(migrate_chat_history, ["--bucket-size", "3"])
+    assert result.output.strip() == "migrated 4 messages"
+    store.insert_many(new[1:])
+
+    assert [(bucket.count, bucket.closed) for bucket in buckets(room)] == [
+        (3, True),
+        (1, True),
+        (2, False),
+    ]
+    assert texts(store.messages(room)) == texts(old + new)
+    assert texts(store.messages(room, limit=5)) == texts((old + new)[:5])
+
+
+def test_migrate_is_safe_to_rerun(cli, room):
+    store = BucketChatHistoryStore(bucket_size=3)
+    documents = messages_for(room, 5)
+    ChatHistoryModel.objects.insert(documents)
+
+    first = cli.invoke(migrate_chat_history, ["--bucket-size", "3"])
+    again = cli.invoke(migrate_chat_history, ["--bucket-size", "3", "--delete-source"])
+
+    assert first.output.strip() == "migrated 5 messages"
+    assert again.output.strip() == "migrated 0 messages"
+    assert ChatHistoryModel.objects(room=room).count() == 0
+    assert texts(store.messages(room)) == texts(documents)
@@ -0,0 +1,209 @@
+import datetime
+import types
+import zlib
+import mongomock
+import mongoengine as me
+import pytest
+from bson import Binary, ObjectId
+from flask import Flask
+from pymongo import ReplaceOne
+from app.commands import compact_chat_collections, compact_values, migrate_chat_history
+from app.databases.chat_history_store import BucketChatHistoryStore, bucket_message
+from app.models import ChatHistoryBucketModel, ChatHistoryModel, ChatRoomModel
+from app.models import fields
+from app.models.fields import (
+    CompressedStringField,
+    SparseBooleanField,
+    SparseListField,
+    compress_text,
+    decompress_text,
+)
+
+LONG_TEXT = "lorem ipsum dolor sit amet " * 100
+
+
+def bulk_write(self, requests, ordered=True):
+    # mongomock's bulk_write predates the sort option pymongo's ReplaceOne now
+    # passes along, so apply the replacements one by one.
+    modified = 0
+    for request in requests:
+        assert isinstance(request, ReplaceOne)
+        modified += self.replace_one(request._filter, request._doc).modified_count
+    return types.SimpleNamespace(modified_count=modified)
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    me.connect(
+        "chat-storage",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+    )
+    monkeypatch.setattr(mongomock.Collection, "bulk_write", bulk_write)
+    yield Flask(__name__).test_cli_runner()
+    me.disconnect()
+
+
+def legacy_message(room, text="hello", **extra):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "text": text,
+        "links": [],
+        "role": "user",
+        "is_image": False,
+        "room": room,
+        "user": ObjectId(),
+        "created_at": now,
+        "updated_at": now,
+        **extra,
+    }
+
+
+def test_compressed_string_field_round_trip():
+    field = CompressedStringField(min_bytes=64, codec="zlib")
+
+    assert field.to_mongo("short") == "short"
+    stored = field.to_mongo(LONG_TEXT)
+    assert isinstance(stored, Binary) and stored[:1] == fields.ZLIB
+    assert len(stored) < len(LONG_TEXT)
+    assert field.to_python(stored) == LONG_TEXT
+    assert field.to_python("short") == "short"
+
+
+def test_compressed_string_field_keeps_incompressible_text():
+    field = CompressedStringField(min_bytes=16, codec="zlib")
+    text = ObjectId().binary.hex()
+
+    assert field.to_mongo(text) == text
+
+
+def test_compressed_string_field_codec_none():
+    field = CompressedStringField(min_bytes=16, codec="none")
+
+    assert field.to_mongo(LONG_TEXT) == LONG_TEXT
+
+
+def test_sparse_fields_round_trip_through_a_document():
+    room = ObjectId()
+    empty = ChatHistoryModel(room=room, role="user", text="hi", links=[]).to_mongo()
+    full = ChatHistoryModel(
+        room=room, role="assistant", text="hi", links=["https://a"], is_image=True
+    ).to_mongo()
+
+    assert ChatHistoryModel.links.db_field not in empty
+    assert ChatHistoryModel.is_image.db_field not in empty
+    assert full[ChatHistoryModel.links.db_field] == ["https://a"]
+    assert full[ChatHistoryModel.is_image.db_field] is True
+
+    read = ChatHistoryModel._from_son(empty)
+    assert read.links == [] and read.is_image is False
+    read = ChatHistoryModel._from_son(full)
+    assert read.links == ["https://a"] and read.is_image is True
+
+
+def test_sparse_field_values():
+    assert SparseListField(me.StringField()).to_mongo([]) is None
+    assert SparseBooleanField().to_mongo(False) is None
+    assert SparseBooleanField().to_mongo(True) is True
+
+
+def test_zstd_text_without_zstandard(monkeypatch):
+    monkeypatch.setattr(fields, "zstandard", None)
+
+    # Writing falls back to zlib, which every reader can decompress.
+    stored = compress_text(LONG_TEXT, codec="zstd")
+    assert stored[:1] == fields.ZLIB
+    assert decompress_text(stored) == LONG_TEXT
+    # Reading text an other node wrote with zstd needs the module.
+    with pytest.raises(RuntimeError, match="zstandard"):
+        decompress_text(Binary(fields.ZSTD + b"\x28\xb5\x2f\xfd"))
+
+
+def test_zlib_text_is_prefixed():
+    stored = compress_text(LONG_TEXT, codec="zlib")
+
+    assert zlib.decompress(stored[1:]).decode("utf-8") == LONG_TEXT
+
+
+def test_compact_values_on_a_legacy_document():
+    room = ObjectId()
+    son = legacy_message(room, text=LONG_TEXT, links=["https://a"], is_image=True)
+
+    document = ChatHistoryModel(**compact_values(ChatHistoryModel, son))
+    stored = document.to_mongo()
+
+    assert set(stored) == {"_id", "x", "l", "r", "i", "o"}
+    assert stored["_id"] == son["_id"]
+    assert stored["o"] == room
+    assert ChatHistoryModel._from_son(stored).text == LONG_TEXT
+
+
+def test_compact_is_safe_to_rerun(cli):
+    room_id = ObjectId()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ChatRoomModel._get_collection().insert_one(
+        {
+            "_id": room_id,
+            "title": "Room",
+            "room": "room-1",
+            "user": ObjectId(),
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    history = ChatHistoryModel._get_collection()
+    history.insert_many([legacy_message(room_id), legacy_message(room_id)])
+    # A row that already has the short keys but kept a dropped one.
+    leftover = ChatHistoryModel(room=room_id, role="user", text="hi").to_mongo()
+    leftover["user"] = ObjectId()
+    history.insert_one(leftover)
+
+    first = cli.invoke(compact_chat_collections).output.splitlines()
+    again = cli.invoke(compact_chat_collections).output.splitlines()
+
+    assert first == [
+        "compacted 1 chat_room documents",
+        "compacted 3 chat_history documents",
+        "compacted 0 chat_history_bucket documents",
+    ]
+    assert again == [
+        "compacted 0 chat_room documents",
+        "compacted 0 chat_history documents",
+        "compacted 0 chat_history_bucket documents",
+    ]
+    (room,) = ChatRoomModel.objects
+    assert room.room == "room-1"
+    assert [message.text for message in ChatHistoryModel.objects(room=room_id)] == [
+        "hello",
+        "hello",
+        "hi",
+    ]
+
+
+def test_compact_keeps_stored_values_of_a_leftover_bucket(cli):
+    room_id = ObjectId()
+    message = ChatHistoryModel(id=ObjectId(), room=room_id, role="user", text=LONG_TEXT)
+    bucket = ChatHistoryBucketModel(
+        id=message.id, room=room_id, count=1, messages=[bucket_message(message)]
+    ).to_mongo()
+    bucket["user"] = ObjectId()
+    ChatHistoryBucketModel._get_collection().insert_one(bucket)
+
+    output = cli.invoke(compact_chat_collections).output.splitlines()
+
+    assert output[-1] == "compacted 1 chat_history_bucket documents"
+    stored = ChatHistoryBucketModel._get_collection().find_one()
+    assert "user" not in stored
+    assert stored["m"] == bucket["m"]
+    (read,) = BucketChatHistoryStore().messages(room_id)
+    assert read.text == LONG_TEXT
+
+
+def test_migrate_refuses_legacy_documents(cli):
+    ChatHistoryModel._get_collection().insert_one(legacy_message(ObjectId()))
+
+    result = cli.invoke(migrate_chat_history)
+
+    assert result.exit_code != 0
+    assert "compact" in result.output
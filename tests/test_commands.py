@@ -0,0 +1,44 @@
+import datetime
+import time
+import mongomock
+import mongoengine as me
+import pytest
+from bson import ObjectId
+from flask import Flask
+from app.commands import convert_otp_dates
+from app.models import OtpEmailModel
+
+
+@pytest.fixture
+def cli():
+    me.connect(
+        "commands", host="mongodb://localhost", mongo_client_class=mongomock.MongoClient
+    )
+    yield Flask(__name__).test_cli_runner()
+    me.disconnect()
+
+
+def test_convert_otp_dates(cli):
+    now = int(time.time())
+    collection = OtpEmailModel._get_collection()
+    collection.insert_one(
+        {
+            "otp": "1234",
+            "user": ObjectId(),
+            "created_at": now,
+            "updated_at": now,
+            "expired_at": now + 300,
+        }
+    )
+    assert cli.invoke(convert_otp_dates).output.strip() == (
+        "converted 1 otp email documents"
+    )
+    assert cli.invoke(convert_otp_dates).output.strip() == (
+        "converted 0 otp email documents"
+    )
+    otp = OtpEmailModel.active(
+        datetime.datetime.fromtimestamp(now, datetime.timezone.utc), otp="1234"
+    )
+    assert otp.expired_at == datetime.datetime.fromtimestamp(
+        now + 300, datetime.timezone.utc
+    ).replace(tzinfo=None)
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import dns.resolver
+from app.utils.email_deliverability import EmailDeliverability, email_deliverability
+from app.utils.validation import Validation
+
+
+class StubResolver:
+    def __init__(self, mx):
+        self.mx = mx
+        self.queries = []
+
+    def resolve(self, domain, rdtype):
+        self.queries.append((domain, rdtype))
+        if domain not in self.mx:
+            raise dns.resolver.NXDOMAIN
+        return [SimpleNamespace(preference=10, exchange=self.mx[domain])]
+
+
+def stub_checker(mx):
+    checker = EmailDeliverability(timeout=1)
+    checker.resolver = StubResolver(mx)
+    return checker
+
+
+def test_deliverable_domain_is_cached():
+    checker = stub_checker({"example.com": "mail.example.com."})
+    assert checker.is_deliverable("Example.com")
+    assert checker.is_deliverable("example.com")
+    assert checker.resolver.queries == [("example.com", "MX")]
+
+
+def test_unknown_domain_is_undeliverable():
+    checker = stub_checker({})
+    assert not checker.is_deliverable("nowhere.invalid")
+    assert not checker.is_deliverable("nowhere.invalid")
+    assert len(checker.resolver.queries) == 1
+
+
+def test_validation_accepts_real_address(monkeypatch):
+    monkeypatch.setattr(
+        email_deliverability,
+        "resolver",
+        StubResolver({"example.com": "mail.example.com."}),
+    )
+    monkeypatch.setattr(email_deliverability, "cache", {})
+    assert Validation.validate_email_sync({}, "alice@example.com", True) == {}
+    errors = Validation.validate_email_sync({}, "alice@nowhere.invalid", True)
+    assert errors == {"email": ["IS_INVALID"]}
@@ -0,0 +1,141 @@
+import datetime
+import time
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+from app.utils.google_identity import GoogleIdentity
+
+CLIENT_ID = "client.apps.googleusercontent.com"
+
+
+class LocalKey:
+    def __init__(self, kid):
+        self.kid = kid
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        self.cert = certificate.public_bytes(serialization.Encoding.PEM).decode()
+        self.signer = crypt.RSASigner.from_string(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ),
+            key_id=kid,
+        )
+
+    def sign(self, **overrides):
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "user@example.com",
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+            **overrides,
+        }
+        return google_jwt.encode(self.signer, claims).decode()
+
+
+class StubResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+class StubSession:
+    def __init__(self, keys):
+        self.keys = keys
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(url)
+        if url == "certs":
+            return StubResponse(
+                {key.kid: key.cert for key in self.keys},
+                headers={"Cache-Control": "public, max-age=3600"},
+            )
+        return StubResponse({"email": "userinfo@example.com"})
+
+
+@pytest.fixture(scope="module")
+def key():
+    return LocalKey("current")
+
+
+@pytest.fixture
+def identity(key):
+    identity = GoogleIdentity(
+        client_ids=[CLIENT_ID], certs_url="certs", userinfo_url="userinfo"
+    )
+    identity.session = StubSession([key])
+    return identity
+
+
+def test_valid_id_token(identity, key):
+    profile = identity.get_profile(key.sign())
+    assert profile["email"] == "user@example.com"
+    assert identity.get_profile(key.sign(sub="other"))["sub"] == "other"
+    assert identity.session.requests == ["certs"]
+
+
+def test_wrong_audience(identity, key):
+    assert identity.get_profile(key.sign(aud="someone-else")) is None
+
+
+def test_wrong_issuer(identity, key):
+    assert identity.get_profile(key.sign(iss="https://evil.example.com")) is None
+
+
+def test_unverified_email(identity, key):
+    assert identity.get_profile(key.sign(email_verified=False)) is None
+
+
+def test_expired_token(identity, key):
+    now = int(time.time())
+    assert identity.get_profile(key.sign(iat=now - 7200, exp=now - 3600)) is None
+
+
+def test_key_rotation_refreshes_certs_once(identity, key):
+    assert identity.get_profile(key.sign())
+    rotated = LocalKey("rotated")
+    identity.session.keys = [key, rotated]
+    identity.certs_fetched_at -= 120
+    assert identity.get_profile(rotated.sign())["email"] == "user@example.com"
+    assert identity.get_profile(rotated.sign())["email"] == "user@example.com"
+    assert identity.session.requests == ["certs", "certs"]
+
+
+def test_unknown_key_does_not_refetch_within_a_minute(identity, key):
+    assert identity.get_profile(key.sign())
+    assert identity.get_profile(LocalKey("unknown").sign()) is None
+    assert identity.session.requests == ["certs"]
+
+
+def test_access_token_uses_userinfo(identity):
+    profile = identity.get_profile("ya29.a0AfH6SMBx")
+    assert profile == {"email": "userinfo@example.com"}
+    assert identity.session.requests == ["userinfo"]
@@ -0,0 +1,36 @@
+import os
+import uuid
+import mongoengine as me
+import pytest
+from pymongo.errors import PyMongoError
+from app.commands import document_models, query_plans
+
+MONGODB_TEST_URL = os.getenv("MONGODB_TEST_URL", "mongodb://localhost:27017")
+
+
+@pytest.fixture
+def mongod():
+    """A scratch database on a real mongod; explain needs the query planner."""
+    name = f"indexes-{uuid.uuid4().hex[:8]}"
+    client = me.connect(name, host=MONGODB_TEST_URL, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        me.disconnect()
+        pytest.skip(f"no mongod reachable at {MONGODB_TEST_URL}")
+    for model in document_models():
+        model.ensure_indexes()
+    yield
+    client.drop_database(name)
+    me.disconnect()
+
+
+def test_repository_queries_use_an_index(mongod):
+    plans = dict(query_plans())
+    assert plans
+    collection_scans = {
+        label: " <- ".join(stages)
+        for label, stages in plans.items()
+        if "COLLSCAN" in stages
+    }
+    assert collection_scans == {}
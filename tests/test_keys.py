@@ -0,0 +1,28 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from app.utils.keys import key_algorithm
+
+
+@pytest.mark.parametrize(
+    "private_key, algorithm",
+    [
+        (rsa.generate_private_key(public_exponent=65537, key_size=2048), "RS256"),
+        (ec.generate_private_key(ec.SECP256R1()), "ES256"),
+        (ec.generate_private_key(ec.SECP384R1()), "ES384"),
+        (ec.generate_private_key(ec.SECP521R1()), "ES512"),
+        (ed25519.Ed25519PrivateKey.generate(), "EdDSA"),
+    ],
+)
+def test_algorithm_matches_key(private_key, algorithm):
+    assert key_algorithm(private_key) == algorithm
+    assert key_algorithm(private_key.public_key()) == algorithm
+    token = jwt.encode({"sub": "user"}, private_key, algorithm=algorithm)
+    assert jwt.decode(token, private_key.public_key(), algorithms=[algorithm]) == {
+        "sub": "user"
+    }
+
+
+def test_unsupported_curve_is_rejected():
+    with pytest.raises(ValueError):
+        key_algorithm(ec.generate_private_key(ec.SECP256K1()))
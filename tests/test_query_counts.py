@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import types
+import mongomock
+import mongoengine as me
+import pytest
+from flask import Flask
+from flask_socketio import SocketIO
+import app
+from app.databases import ChatHistoryWriteBehind
+from app.models import ChatHistoryModel, ChatRoomModel, UserModel
+from app.utils import (
+    MemoryIdempotencyStore,
+    MemorySocketState,
+    RevocationFilter,
+    query_counter,
+    token_auth_cache,
+)
+from app.utils import ai_generator
+
+# mongomock never talks to pymongo's monitoring, so report its collection
+# calls to the query counter as the commands a server would have received.
+COMMANDS = {
+    "find": "find",
+    "find_one": "find",
+    "count_documents": "count",
+    "aggregate": "aggregate",
+    "distinct": "distinct",
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "bulk_write": "update",
+    "find_one_and_update": "findAndModify",
+    "find_one_and_replace": "findAndModify",
+    "find_one_and_delete": "findAndModify",
+    "delete_one": "delete",
+    "delete_many": "delete",
+}
+_in_command = contextvars.ContextVar("in_command", default=False)
+
+
+def reporting(method, command_name):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        # find_one and friends call find internally; count the outer call only.
+        if _in_command.get():
+            return method(*args, **kwargs)
+        query_counter.started(types.SimpleNamespace(command_name=command_name))
+        token = _in_command.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _in_command.reset(token)
+
+    return wrapper
+
+
+@pytest.fixture
+def user(monkeypatch):
+    me.connect(
+        "query-counts",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+    )
+    for name, command_name in COMMANDS.items():
+        method = getattr(mongomock.Collection, name)
+        monkeypatch.setattr(mongomock.Collection, name, reporting(method, command_name))
+    user = UserModel(
+        username="alice",
+        email="alice@example.com",
+        provider="internal",
+        avatar="avatar.png",
+    ).save()
+    monkeypatch.setattr(
+        token_auth_cache, "authenticate", lambda token: ({"iat": 0}, user)
+    )
+    yield user
+    me.disconnect()
+
+
+@pytest.fixture
+def flask_app(monkeypatch):
+    # The routers and sockets import these from the package, which
+    # create_app would have populated.
+    socket_io = SocketIO()
+    for name, value in {
+        "socket_io": socket_io,
+        "socket_state": MemorySocketState(),
+        "chat_history_buffer": ChatHistoryWriteBehind(None),
+        "idempotency_store": MemoryIdempotencyStore(),
+        "revocation_filter": RevocationFilter(),
+        "countdown_scheduler": None,
+        "async_mongo": None,
+        "_HISTORY": [],
+    }.items():
+        monkeypatch.setattr(app, name, value, raising=False)
+    monkeypatch.setattr(ai_generator, "gemini_api_key", "test")
+    monkeypatch.setattr(ai_generator, "imagekit_public_key", "test")
+    monkeypatch.setattr(ai_generator, "imagekit_private_key", "test")
+    monkeypatch.setattr(ai_generator, "imagekit_url_endpoint", "https://ik.test")
+
+    from app.middlewares import register_middlewares
+    from app.routers import register_blueprints
+    from app.sockets import chat_bot
+
+    for name in ("socket_state", "chat_history_buffer", "idempotency_store"):
+        monkeypatch.setattr(chat_bot, name, getattr(app, name))
+
+    flask_app = Flask(__name__)
+    flask_app.config["QUERY_COUNT_HEADER"] = True
+    register_blueprints(flask_app)
+    register_middlewares(flask_app)
+    socket_io.init_app(flask_app)
+    chat_bot.register_chat_bot_socketio_events(socket_io)
+    return flask_app
+
+
+def rooms_for(user, count):
+    rooms = []
+    for index in range(count):
+        room = ChatRoomModel(user=user, room=f"room-{index}", title=f"Room {index}")
+        rooms.append(room.save())
+    return rooms
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_rooms_endpoint_query_count(user, flask_app, count):
+    rooms_for(user, count)
+
+    response = flask_app.test_client().get(
+        "/chat-bot/rooms", headers={"Authorization": "Bearer token"}
+    )
+
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == count
+    # A single read of the list, however many rooms.
+    assert response.headers["X-Query-Count"] == "1"
+
+
+@pytest.mark.parametrize("count", [1, 150])
+def test_chat_history_replay_query_count(user, flask_app, count):
+    (room,) = rooms_for(user, 1)
+    ChatHistoryModel.objects.insert(
+        [
+            ChatHistoryModel(room=room, role="user", text=f"message {index}")
+            for index in range(count)
+        ]
+    )
+    socket_io = app.socket_io
+
+    # The test client tears its request context down, which stops the
+    # counter, so keep hold of the counts it started with.
+    counts = query_counter.start()
+    try:
+        client = socket_io.test_client(
+            flask_app,
+            namespace="/chat-bot",
+            auth={"token": "token", "room": room.room},
+        )
+    finally:
+        query_counter.stop()
+
+    (history,) = [
+        event["args"][0]
+        for event in client.get_received("/chat-bot")
+        if event["name"] == "chat"
+    ]
+    assert len(history["items"]) == count
+    # The room lookup and one read of its messages, with no per-message
+    # dereference of the room or user.
+    assert counts == {"find": 2}
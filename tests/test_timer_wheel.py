@@ -0,0 +1,43 @@
+import pytest
+from app.utils.timer_wheel import TimerWheel
+
+
+def fired_at(wheel, until):
+    fired = {}
+    for tick in range(wheel.current_tick + 1, until + 1):
+        for item in wheel.advance(tick):
+            fired[item] = tick
+    return fired
+
+
+@pytest.mark.parametrize("start", [0, 1, 59, 60, 3599, 3600, 7201])
+@pytest.mark.parametrize(
+    "delay", [1, 2, 59, 60, 61, 119, 120, 121, 3599, 3600, 3601, 7200, 7261]
+)
+def test_fires_on_the_scheduled_tick(start, delay):
+    wheel = TimerWheel(start)
+    wheel.schedule(start + delay, "item")
+    assert fired_at(wheel, start + delay + 5) == {"item": start + delay}
+
+
+def test_minute_boundary_fires_on_time():
+    wheel = TimerWheel(10)
+    wheel.schedule(120, "minute")
+    wheel.schedule(3600, "hour")
+    fired = fired_at(wheel, 3700)
+    assert fired == {"minute": 120, "hour": 3600}
+
+
+def test_past_fire_time_fires_on_next_tick():
+    wheel = TimerWheel(100)
+    wheel.schedule(50, "late")
+    assert wheel.advance(101) == ["late"]
+
+
+def test_large_jump_returns_everything_due():
+    wheel = TimerWheel(0)
+    for delay in (1, 60, 61, 3600, 5000):
+        wheel.schedule(delay, delay)
+    assert sorted(wheel.advance(4000)) == [1, 60, 61, 3600]
+    assert wheel.advance(5000) == [5000]
+    assert wheel.advance(9000) == []
@@ -0,0 +1,80 @@
+import asyncio
+import datetime
+import mongomock
+import mongoengine as me
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+import app
+from app.databases import UserDatabase, ResetPasswordDatabase
+from app.models import UserModel
+from app.utils import AuthJwt, RevocationFilter, key_id
+from app.utils.token_auth_cache import TokenAuthCache, token_auth_cache
+
+
+@pytest.fixture
+def user(monkeypatch):
+    me.connect(
+        "token-auth-cache",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+    )
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+    monkeypatch.setattr(app, "private_key", private_key, raising=False)
+    monkeypatch.setattr(app, "jwt_algorithm", "RS256", raising=False)
+    monkeypatch.setattr(app, "jwt_key_id", key_id(public_key), raising=False)
+    monkeypatch.setattr(
+        app,
+        "verification_keys",
+        {key_id(public_key): (public_key, "RS256")},
+        raising=False,
+    )
+    monkeypatch.setattr(app, "revocation_filter", RevocationFilter(), raising=False)
+    yield UserModel(
+        username="alice",
+        email="alice@example.com",
+        password="hash",
+        provider="internal",
+        avatar="avatar.png",
+    ).save()
+    me.disconnect()
+
+
+def access_token(user):
+    return AuthJwt.generate_jwt_sync(
+        f"{user.id}",
+        datetime.datetime.now(datetime.timezone.utc),
+        "family",
+        user.token_version,
+    )
+
+
+def test_password_change_retires_access_tokens(user):
+    token = access_token(user)
+    assert token_auth_cache.authenticate(token)
+
+    asyncio.run(UserDatabase.update("password", user_id=user.id, password="new"))
+
+    assert token_auth_cache.authenticate(token) is None
+    # Another process's cache is not invalidated by the signal, so the
+    # version check itself has to reject the token.
+    assert TokenAuthCache()._verify(token) is None
+    assert token_auth_cache.authenticate(access_token(user.reload()))
+
+
+def test_password_reset_retires_access_tokens(user):
+    token = access_token(user)
+    asyncio.run(
+        ResetPasswordDatabase.insert(
+            user.email,
+            "reset-token",
+            datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1),
+        )
+    )
+    asyncio.run(
+        ResetPasswordDatabase.delete(
+            "user_password_by_token_email", user_id=f"{user.id}", new_password="new"
+        )
+    )
+    assert user.reload().token_version == 1
+    assert TokenAuthCache()._verify(token) is None